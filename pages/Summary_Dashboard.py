@@ -2,69 +2,183 @@ import os
 import sqlite3
 from datetime import date
 
+import numpy as np
 import pandas as pd
-import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
 
-from src.functions.sql_db import DB_PATH
+from src.functions.sql_db import DB_PATH, connect_readonly
 
+# Sorted so np.searchsorted can map decision strings to codes; 'unknown'
+# doubles as the bucket for NaN and anything unexpected.
+DECISION_LABELS = np.array(["buy", "hold", "sell", "unknown"], dtype=object)
 
-def load_trading_decisions(db_path: str) -> tuple[pd.DataFrame, str | None]:
-    """Load trading_decisions as a DataFrame in read-only mode."""
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_filter_options(db_path: str, mtime: float | None) -> tuple[dict | None, str | None]:
+    """Load the sidebar filter bounds (coin list, date range) straight from SQL.
+
+    Cached per (db_path, mtime) like the detail query below.
+    """
     if not os.path.exists(db_path):
-        return pd.DataFrame(), f"Database not found: {db_path}"
+        return None, f"Database not found: {db_path}"
 
     try:
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        conn = connect_readonly(db_path)
         table_exists = pd.read_sql_query(
             "SELECT name FROM sqlite_master WHERE type='table' AND name='trading_decisions';",
             conn,
         )
         if table_exists.empty:
             conn.close()
-            return pd.DataFrame(), "Table 'trading_decisions' does not exist yet."
+            return None, "Table 'trading_decisions' does not exist yet."
 
-        df = pd.read_sql_query("SELECT * FROM trading_decisions", conn)
+        coins = pd.read_sql_query(
+            "SELECT DISTINCT coin_name FROM trading_decisions "
+            "WHERE coin_name IS NOT NULL ORDER BY coin_name;",
+            conn,
+        )
+        bounds = pd.read_sql_query(
+            "SELECT MIN(timestamp) AS min_ts, MAX(timestamp) AS max_ts FROM trading_decisions;",
+            conn,
+        )
+        conn.close()
+    except sqlite3.Error as exc:
+        return None, f"Failed to read database: {exc}"
+
+    min_ts = pd.to_datetime(bounds.at[0, "min_ts"], errors="coerce")
+    max_ts = pd.to_datetime(bounds.at[0, "max_ts"], errors="coerce")
+    return {
+        "coins": coins["coin_name"].astype(str).tolist(),
+        "min_date": min_ts.date() if pd.notna(min_ts) else None,
+        "max_date": max_ts.date() if pd.notna(max_ts) else None,
+    }, None
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_trading_decisions(
+    db_path: str,
+    mtime: float | None,
+    coins: tuple[str, ...],
+    start_date: str,
+    end_date: str,
+) -> tuple[pd.DataFrame, str | None]:
+    """Load the filtered slice of trading_decisions in read-only mode.
+
+    Coin and date filtering plus the timestamp ordering are pushed into
+    SQL, so only the rows the dashboard will actually render reach
+    pandas. Cached per (db_path, mtime, filter state).
+    """
+    if not coins:
+        return pd.DataFrame(), None
+
+    try:
+        conn = connect_readonly(db_path)
+        placeholders = ",".join("?" * len(coins))
+        df = pd.read_sql_query(
+            f"""
+            SELECT * FROM trading_decisions
+            WHERE coin_name IN ({placeholders})
+              AND date(timestamp) >= ?
+              AND date(timestamp) <= ?
+            ORDER BY timestamp DESC
+            """,
+            conn,
+            params=(*coins, start_date, end_date),
+            # Type the columns during the read instead of re-coercing each
+            # one into a fresh Series afterwards (init_db guarantees the
+            # schema, including the migrated reflection columns).
+            # coin_name/decision/result_type deliberately stay as plain
+            # strings: the KPI and chart paths group/count on them, and
+            # categorical groupby is slower than string groupby in pandas.
+            # Cast to category only at a Plotly hand-off if legend
+            # ordering ever needs it.
+            parse_dates=["timestamp", "reflection_timestamp"],
+            dtype={
+                "is_real_trade": "Int8",
+                "confidence_score": "Float64",
+                "profit_loss": "Float64",
+                "coin_balance": "Float64",
+                "coin_krw_price": "Float64",
+                "krw_balance": "Float64",
+                "coin_avg_buy_price": "Float64",
+                "trade_amount": "Float64",
+            },
+        )
         conn.close()
     except sqlite3.Error as exc:
         return pd.DataFrame(), f"Failed to read database: {exc}"
 
-    if df.empty:
-        return df, None
+    return df, None
 
-    if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-    if "is_real_trade" in df.columns:
-        df["is_real_trade"] = pd.to_numeric(df["is_real_trade"], errors="coerce")
-    if "confidence_score" in df.columns:
-        df["confidence_score"] = pd.to_numeric(df["confidence_score"], errors="coerce")
-    if "profit_loss" in df.columns:
-        df["profit_loss"] = pd.to_numeric(df["profit_loss"], errors="coerce")
 
-    return df, None
+@st.cache_data(ttl=60, show_spinner=False)
+def load_portfolio_snapshot(
+    db_path: str,
+    mtime: float | None,
+    coins: tuple[str, ...],
+) -> tuple[pd.DataFrame, float]:
+    """Load the latest balance row per selected coin plus the most recent
+    KRW balance.
 
+    SQLite's MAX(timestamp) GROUP BY coin_name resolves the bare columns
+    from the max row, so this is one index lookup per coin instead of a
+    full sort + groupby-first in pandas.
+    """
+    if not coins:
+        return pd.DataFrame(), 0.0
+
+    try:
+        conn = connect_readonly(db_path)
+        placeholders = ",".join("?" * len(coins))
+        latest_by_coin = pd.read_sql_query(
+            f"""
+            SELECT coin_name, coin_balance, coin_krw_price, MAX(timestamp) AS timestamp
+            FROM trading_decisions
+            WHERE coin_name IN ({placeholders})
+            GROUP BY coin_name
+            """,
+            conn,
+            params=coins,
+            dtype={"coin_balance": "Float64", "coin_krw_price": "Float64"},
+        )
+        cash = pd.read_sql_query(
+            """
+            SELECT krw_balance FROM trading_decisions
+            WHERE krw_balance IS NOT NULL
+            ORDER BY timestamp DESC
+            LIMIT 1
+            """,
+            conn,
+        )
+        conn.close()
+    except sqlite3.Error:
+        return pd.DataFrame(), 0.0
+
+    cash_value = float(cash.at[0, "krw_balance"]) if not cash.empty else 0.0
+    return latest_by_coin, cash_value
 
-def apply_filters(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return df
 
+def build_sidebar_filters(options: dict) -> tuple[list[str], tuple, list[str]]:
+    """Render the sidebar widgets from SQL-derived bounds and return
+    (selected coins, date range, trade modes)."""
     st.sidebar.header("Filters")
 
-    coin_options = sorted(df["coin_name"].dropna().astype(str).unique().tolist())
+    coin_options = options["coins"]
     selected_coins = st.sidebar.multiselect(
         "Coins to include",
         options=coin_options,
         default=coin_options,
     )
 
-    timestamp_series = df["timestamp"].dropna()
-    if timestamp_series.empty:
+    if options["min_date"] is None or options["max_date"] is None:
         start_date = end_date = date.today()
-        date_range = st.sidebar.date_input("Date range", value=(start_date, end_date))
     else:
-        min_date = timestamp_series.min().date()
-        max_date = timestamp_series.max().date()
-        date_range = st.sidebar.date_input("Date range", value=(min_date, max_date))
+        start_date = options["min_date"]
+        end_date = options["max_date"]
+    date_range = st.sidebar.date_input("Date range", value=(start_date, end_date))
+    if not (isinstance(date_range, tuple) and len(date_range) == 2):
+        date_range = (start_date, end_date)
 
     trade_mode = st.sidebar.multiselect(
         "Trade type",
@@ -72,88 +186,67 @@ def apply_filters(df: pd.DataFrame) -> pd.DataFrame:
         default=["Real", "Simulated", "Unknown"],
     )
 
-    filtered = df.copy()
+    return selected_coins, date_range, trade_mode
 
-    if selected_coins:
-        filtered = filtered[filtered["coin_name"].isin(selected_coins)]
-    else:
-        return pd.DataFrame(columns=df.columns)
 
-    if isinstance(date_range, tuple) and len(date_range) == 2:
-        start, end = date_range
-        filtered = filtered[
-            filtered["timestamp"].notna()
-            & (filtered["timestamp"].dt.date >= start)
-            & (filtered["timestamp"].dt.date <= end)
-        ]
+def apply_trade_mode_filter(df: pd.DataFrame, trade_mode: list[str]) -> pd.DataFrame:
+    """Keep rows whose real/simulated/unknown status matches the sidebar."""
+    if df.empty:
+        return df
 
-    allowed_real_values = []
+    # One boolean mask per selected mode; preserves the timestamp DESC
+    # order coming from the SQL query, so no concat or re-sort is needed
+    mask = pd.Series(False, index=df.index)
     if "Real" in trade_mode:
-        allowed_real_values.append(1)
+        mask |= df["is_real_trade"].eq(1)
     if "Simulated" in trade_mode:
-        allowed_real_values.append(0)
+        mask |= df["is_real_trade"].eq(0)
     if "Unknown" in trade_mode:
-        filtered_unknown = filtered[filtered["is_real_trade"].isna()]
-    else:
-        filtered_unknown = pd.DataFrame(columns=filtered.columns)
-
-    filtered_known = filtered[filtered["is_real_trade"].isin(allowed_real_values)]
-    filtered = pd.concat([filtered_known, filtered_unknown], ignore_index=True)
+        mask |= df["is_real_trade"].isna()
 
-    return filtered.sort_values(by="timestamp", ascending=False, na_position="last")
+    return df[mask]
 
 
-def render_portfolio_pie(df: pd.DataFrame) -> None:
+def render_portfolio_pie(latest_by_coin: pd.DataFrame, cash_value: float) -> None:
     st.subheader("Portfolio Balance")
-    required_cols = {"coin_name", "coin_balance", "coin_krw_price", "krw_balance"}
-    if not required_cols.issubset(df.columns):
-        st.info("Portfolio chart unavailable (required balance columns are missing).")
+    required_cols = {"coin_name", "coin_balance", "coin_krw_price"}
+    if latest_by_coin.empty or not required_cols.issubset(latest_by_coin.columns):
+        st.info("No valid portfolio balance data is available for the selected filters.")
         return
 
-    latest_by_coin = (
-        df.sort_values(by="timestamp", ascending=False, na_position="last")
-        .dropna(subset=["coin_name"])
-        .groupby("coin_name", as_index=False)
-        .first()
+    latest_by_coin = latest_by_coin.assign(
+        value_krw=latest_by_coin["coin_balance"] * latest_by_coin["coin_krw_price"]
     )
-
-    latest_by_coin["coin_balance"] = pd.to_numeric(latest_by_coin["coin_balance"], errors="coerce")
-    latest_by_coin["coin_krw_price"] = pd.to_numeric(latest_by_coin["coin_krw_price"], errors="coerce")
-    latest_by_coin["value_krw"] = latest_by_coin["coin_balance"] * latest_by_coin["coin_krw_price"]
     coin_values = latest_by_coin[["coin_name", "value_krw"]].dropna()
     # Ignore dust-size assets so chart reflects practical portfolio composition.
     coin_values = coin_values[coin_values["value_krw"] >= 1.0]
     coin_values = coin_values.rename(columns={"coin_name": "asset"})
 
-    latest_cash = (
-        pd.to_numeric(df["krw_balance"], errors="coerce")
-        .dropna()
-        .head(1)
-    )
-    cash_value = float(latest_cash.iloc[0]) if not latest_cash.empty else 0.0
-
-    pie_df = coin_values.copy()
     if cash_value > 0:
         pie_df = pd.concat(
-            [pie_df, pd.DataFrame([{"asset": "KRW", "value_krw": cash_value}])],
+            [coin_values, pd.DataFrame([{"asset": "KRW", "value_krw": cash_value}])],
             ignore_index=True,
+            copy=False,
         )
+    else:
+        pie_df = coin_values
 
     if pie_df.empty:
         st.info("No valid portfolio balance data is available for the selected filters.")
         return
 
-    fig = px.pie(
-        pie_df,
-        names="asset",
-        values="value_krw",
-        title="Portfolio Composition (KRW Value)",
-    )
-    fig.update_traces(
-        textposition="inside",
-        texttemplate="%{label}<br>%{percent:.2%}<br>%{value:,.2f} KRW",
-        hovertemplate="%{label}: %{value:,.2f} KRW (%{percent:.2%})<extra></extra>",
+    # go.Pie from the aggregated arrays: px.pie would re-scan the frame
+    # and attach hover metadata we immediately override anyway
+    fig = go.Figure(
+        go.Pie(
+            labels=pie_df["asset"].to_numpy(),
+            values=pie_df["value_krw"].to_numpy(dtype=float),
+            textposition="inside",
+            texttemplate="%{label}<br>%{percent:.2%}<br>%{value:,.2f} KRW",
+            hovertemplate="%{label}: %{value:,.2f} KRW (%{percent:.2%})<extra></extra>",
+        )
     )
+    fig.update_layout(title_text="Portfolio Composition (KRW Value)")
     st.plotly_chart(fig, use_container_width=True)
 
     total_value = float(pie_df["value_krw"].sum())
@@ -163,38 +256,46 @@ def render_portfolio_pie(df: pd.DataFrame) -> None:
 
 def render_kpis(df: pd.DataFrame) -> None:
     total = len(df)
-    buy_count = int((df["decision"] == "buy").sum()) if "decision" in df.columns else 0
-    sell_count = int((df["decision"] == "sell").sum()) if "decision" in df.columns else 0
-    hold_count = int((df["decision"] == "hold").sum()) if "decision" in df.columns else 0
 
-    real_count = int((df["is_real_trade"] == 1).sum()) if "is_real_trade" in df.columns else 0
-    sim_count = int((df["is_real_trade"] == 0).sum()) if "is_real_trade" in df.columns else 0
+    # One value_counts pass per label column instead of one full boolean
+    # scan per KPI (three for decisions, two for trade mode)
+    decision_counts = (
+        df["decision"].value_counts() if "decision" in df.columns else pd.Series(dtype=int)
+    )
+    buy_count = int(decision_counts.get("buy", 0))
+    sell_count = int(decision_counts.get("sell", 0))
+    hold_count = int(decision_counts.get("hold", 0))
 
-    avg_conf = (
-        float(df["confidence_score"].mean())
-        if "confidence_score" in df.columns and df["confidence_score"].notna().any()
-        else None
+    mode_counts = (
+        df["is_real_trade"].value_counts() if "is_real_trade" in df.columns else pd.Series(dtype=int)
     )
+    real_count = int(mode_counts.get(1, 0))
+    sim_count = int(mode_counts.get(0, 0))
+
+    # mean() of an all-NA column is NA, so no separate notna() prescan
+    conf_mean = df["confidence_score"].mean() if "confidence_score" in df.columns else None
+    avg_conf = None if conf_mean is None or pd.isna(conf_mean) else float(conf_mean)
 
+    # Length check instead of fillna/astype/strip: one vectorized kernel
+    # and no trimmed copy just to test emptiness (NaN length -> 0).
     reflection_available = (
-        df["reflection"].fillna("").astype(str).str.strip() != ""
+        df["reflection"].str.len().fillna(0) > 0
         if "reflection" in df.columns
         else pd.Series(dtype=bool)
     )
     reflected_count = int(reflection_available.sum()) if len(reflection_available) else 0
 
-    avg_profit = (
-        float(df["profit_loss"].mean())
-        if "profit_loss" in df.columns and df["profit_loss"].notna().any()
-        else None
-    )
+    pnl_mean = df["profit_loss"].mean() if "profit_loss" in df.columns else None
+    avg_profit = None if pnl_mean is None or pd.isna(pnl_mean) else float(pnl_mean)
 
+    # Lowercase once and reuse; NaN stays NaN and is dropped with the
+    # empty strings below
     result_series = (
-        df["result_type"].fillna("").astype(str).str.strip().str.lower()
+        df["result_type"].str.lower()
         if "result_type" in df.columns
         else pd.Series(dtype=str)
     )
-    valid_results = result_series[result_series != ""]
+    valid_results = result_series[result_series.notna() & (result_series != "")]
     win_rate = (
         float((valid_results == "gain").mean() * 100)
         if not valid_results.empty
@@ -221,35 +322,49 @@ def render_charts_and_table(df: pd.DataFrame) -> None:
     col1, col2 = st.columns(2)
 
     with col1:
-        decision_counts = (
-            df["decision"]
-            .fillna("unknown")
-            .astype(str)
-            .value_counts()
-            .rename_axis("decision")
-            .reset_index(name="count")
+        # Integer-codes fast path: with <=4 distinct decisions, mapping to
+        # small ints and bincounting beats hashing one string per row in
+        # value_counts. Values outside DECISION_LABELS fall into 'unknown'.
+        decisions = df["decision"].fillna("unknown").to_numpy(dtype=object)
+        codes = np.clip(np.searchsorted(DECISION_LABELS, decisions), 0, 3)
+        codes[DECISION_LABELS[codes] != decisions] = 3
+        counts = np.bincount(codes, minlength=4)
+        present = counts > 0
+        # Traces built straight from the aggregated arrays (here and for
+        # the timeline below): <=4 bars don't need px's frame handling,
+        # and the serialized payload stays minimal
+        fig_decision = go.Figure(
+            go.Bar(x=DECISION_LABELS[present], y=counts[present])
         )
-        fig_decision = px.bar(
-            decision_counts,
-            x="decision",
-            y="count",
-            title="Decision Distribution",
+        fig_decision.update_layout(
+            title_text="Decision Distribution",
+            xaxis_title="decision",
+            yaxis_title="count",
         )
         st.plotly_chart(fig_decision, use_container_width=True)
 
     with col2:
-        timeline_source = df[df["timestamp"].notna()].copy()
-        if timeline_source.empty:
+        # Only the timestamp column is needed for the timeline; avoid
+        # copying the whole filtered frame
+        timestamps = df.loc[df["timestamp"].notna(), "timestamp"]
+        if timestamps.empty:
             st.info("Timeline unavailable (no valid timestamps).")
         else:
-            timeline_source["date"] = timeline_source["timestamp"].dt.date
-            timeline = timeline_source.groupby("date").size().reset_index(name="count")
-            fig_timeline = px.line(
-                timeline,
-                x="date",
-                y="count",
-                markers=True,
-                title="Decisions Over Time",
+            # floor('D') keeps the buckets as datetime64, so counting and
+            # sorting stay on the vectorized hashtable path instead of
+            # hashing per-row Python date objects
+            timeline = timestamps.dt.floor("D").value_counts().sort_index()
+            fig_timeline = go.Figure(
+                go.Scatter(
+                    x=timeline.index.to_numpy(),
+                    y=timeline.to_numpy(),
+                    mode="lines+markers",
+                )
+            )
+            fig_timeline.update_layout(
+                title_text="Decisions Over Time",
+                xaxis_title="date",
+                yaxis_title="count",
             )
             st.plotly_chart(fig_timeline, use_container_width=True)
 
@@ -278,22 +393,36 @@ def main() -> None:
     st.title("Trading Summary Dashboard")
     st.caption("Read-only landing page for trade statistics. No trade execution is performed here.")
 
-    df, error = load_trading_decisions(DB_PATH)
+    db_mtime = os.path.getmtime(DB_PATH) if os.path.exists(DB_PATH) else None
+    options, error = load_filter_options(DB_PATH, db_mtime)
     if error:
         st.warning(error)
         return
 
-    if df.empty:
+    if not options["coins"]:
         st.info("No trading records found yet in 'trading_decisions'.")
         return
 
     st.caption(f"DB path: {DB_PATH}")
     st.caption(f"Last refreshed: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-    filtered = apply_filters(df)
+    selected_coins, date_range, trade_mode = build_sidebar_filters(options)
+    df, error = load_trading_decisions(
+        DB_PATH,
+        db_mtime,
+        tuple(selected_coins),
+        date_range[0].isoformat(),
+        date_range[1].isoformat(),
+    )
+    if error:
+        st.warning(error)
+        return
+
+    filtered = apply_trade_mode_filter(df, trade_mode)
     render_kpis(filtered)
     st.divider()
-    render_portfolio_pie(filtered)
+    latest_by_coin, cash_value = load_portfolio_snapshot(DB_PATH, db_mtime, tuple(selected_coins))
+    render_portfolio_pie(latest_by_coin, cash_value)
     st.divider()
     render_charts_and_table(filtered)
 
@@ -4,32 +4,65 @@ import sqlite3
 import pandas as pd
 import streamlit as st
 
-from src.functions.sql_db import DB_PATH
+from src.functions.sql_db import DB_PATH, connect_readonly
 
 
-def load_trade_diary_entries(db_path: str) -> tuple[pd.DataFrame, str | None]:
-    """Load trade diary entries in read-only mode."""
+DIARY_FILTER = "reflection IS NOT NULL AND TRIM(reflection) <> ''"
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def count_trade_diary_entries(db_path: str, mtime: float | None) -> tuple[int, str | None]:
+    """Count diary entries so the pager knows how many pages exist."""
     if not os.path.exists(db_path):
-        return pd.DataFrame(), f"Database not found: {db_path}"
+        return 0, f"Database not found: {db_path}"
 
     try:
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        conn = connect_readonly(db_path)
         table_exists = pd.read_sql_query(
             "SELECT name FROM sqlite_master WHERE type='table' AND name='trading_decisions';",
             conn,
         )
         if table_exists.empty:
             conn.close()
-            return pd.DataFrame(), "Table 'trading_decisions' does not exist yet."
+            return 0, "Table 'trading_decisions' does not exist yet."
+
+        count = pd.read_sql_query(
+            f"SELECT COUNT(*) AS n FROM trading_decisions WHERE {DIARY_FILTER};",
+            conn,
+        )
+        conn.close()
+    except sqlite3.Error as exc:
+        return 0, f"Failed to read database: {exc}"
+
+    return int(count.at[0, "n"]), None
+
 
+@st.cache_data(ttl=60, show_spinner=False)
+def load_trade_diary_entries(
+    db_path: str,
+    mtime: float | None,
+    page_size: int,
+    page: int,
+) -> tuple[pd.DataFrame, str | None]:
+    """Load one page of trade diary entries in read-only mode.
+
+    Ordering (newest reflection first, falling back to the trade
+    timestamp) and pagination happen in SQL, so only the visible page is
+    materialized and rendered. Cached per (db_path, mtime, page state).
+    """
+    try:
+        conn = connect_readonly(db_path)
         df = pd.read_sql_query(
-            """
-            SELECT timestamp, reflection_timestamp, decision, reflection
+            f"""
+            SELECT timestamp, decision, reflection,
+                   COALESCE(NULLIF(reflection_timestamp, ''), timestamp) AS sort_ts
             FROM trading_decisions
-            WHERE reflection IS NOT NULL
-              AND TRIM(reflection) <> ''
+            WHERE {DIARY_FILTER}
+            ORDER BY sort_ts DESC
+            LIMIT ? OFFSET ?
             """,
             conn,
+            params=(page_size, (page - 1) * page_size),
         )
         conn.close()
     except sqlite3.Error as exc:
@@ -38,14 +71,8 @@ def load_trade_diary_entries(db_path: str) -> tuple[pd.DataFrame, str | None]:
     if df.empty:
         return df, None
 
-    df["timestamp_dt"] = pd.to_datetime(df["timestamp"], errors="coerce")
-    df["reflection_timestamp_dt"] = pd.to_datetime(df["reflection_timestamp"], errors="coerce")
-    df["sort_dt"] = df["reflection_timestamp_dt"].combine_first(df["timestamp_dt"])
-    df = df.sort_values(by="sort_dt", ascending=False, na_position="last")
-
-    df["Date"] = df["timestamp_dt"].dt.strftime("%Y-%m-%d %H:%M:%S")
-    fallback_date = df["sort_dt"].dt.strftime("%Y-%m-%d %H:%M:%S")
-    df["Date"] = df["Date"].fillna(fallback_date).fillna("-")
+    timestamp_dt = pd.to_datetime(df["timestamp"].fillna(df["sort_ts"]), errors="coerce")
+    df["Date"] = timestamp_dt.dt.strftime("%Y-%m-%d %H:%M:%S").fillna("-")
     df["Decision"] = df["decision"].fillna("unknown").astype(str).str.upper()
     df["Reflection"] = df["reflection"].fillna("").astype(str)
 
@@ -57,19 +84,30 @@ def main() -> None:
     st.title("Trade Diary")
     st.caption("Latest reflection appears first. Data is read-only from trading_decisions.")
 
-    df, error = load_trade_diary_entries(DB_PATH)
+    db_mtime = os.path.getmtime(DB_PATH) if os.path.exists(DB_PATH) else None
+    total, error = count_trade_diary_entries(DB_PATH, db_mtime)
     if error:
         st.warning(error)
         return
 
-    if df.empty:
+    if total == 0:
         st.info("No reflections found yet in 'trading_decisions'.")
         return
 
+    st.sidebar.header("Pages")
+    page_size = int(st.sidebar.number_input("Entries per page", min_value=5, max_value=100, value=25, step=5))
+    max_page = (total + page_size - 1) // page_size
+    page = int(st.sidebar.number_input("Page", min_value=1, max_value=max_page, value=1, step=1))
+
+    df, error = load_trade_diary_entries(DB_PATH, db_mtime, page_size, page)
+    if error:
+        st.warning(error)
+        return
+
     st.caption(f"DB path: {DB_PATH}")
     st.caption(f"Last refreshed: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}")
     st.markdown("### Diary Entries")
-    st.caption("Newest entries appear first.")
+    st.caption(f"Newest entries appear first. Page {page} of {max_page} ({total} entries).")
 
     for entry in df.itertuples(index=False):
         st.markdown(
@@ -1,66 +1,62 @@
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-
-# 1. get upbit chart, 30days
-
-
-import json
-import pyupbit
 import uuid
+
 import jwt
 import requests
+from dotenv import load_dotenv
 
+load_dotenv()
 
-access_key = os.getenv("UPBIT_OPEN_API_ACCESS_KEY")
-secret_key = os.getenv("UPBIT_OPEN_API_SECRET_KEY")
-# upbit = pyupbit.Upbit(access, secret)
-# current_cash = upbit.get_balance("KRW")
-# current_ada = upbit.get_balance("ADA")
-
-# Generate the JWT as shown in Step 1
-payload = {
-    "access_key": access_key,
-    "nonce": str(uuid.uuid4())
-}
-encoded_jwt = jwt.encode(payload, secret_key, algorithm="HS256")
-authorization_header = f"Bearer {encoded_jwt}"
-
-# Define the API endpoint and headers
-url = "https://api.upbit.com/v1/accounts"
-headers = {"Authorization": authorization_header}
-
-# Send the GET request
-response = requests.get(url, headers=headers)
-
-# Check the response
-if response.status_code == 200:
-    portfolio = response.json()
-    for item in portfolio:
-        print(f"Currency: {item['currency']}, Balance: {item['balance']}, Locked: {item['locked']}")
-else:
-    print(f"Error: {response.status_code}, {response.text}")
-
-
-import json
-import pyupbit
-
-
-access = os.getenv("UPBIT_OPEN_API_ACCESS_KEY")
-secret = os.getenv("UPBIT_OPEN_API_SECRET_KEY")
-upbit = pyupbit.Upbit(access, secret)
-
-# if result["decision"] == "buy":
-#     print("buy")
-#     upbit.buy_market_order("KRW-ADA", current_cash)
-# elif result["decision"] == "sell":
-#     print("sell")
-#     upbit.sell_market_order("KRW-ADA", current_ada)
-# else:
-#     print("hold")
-#     pass
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-# upbit.sell_market_order("KRW-LINK", 1)
\ No newline at end of file
+ACCOUNTS_URL = "https://api.upbit.com/v1/accounts"
+
+# Shared session: repeated polling reuses the TCP/TLS connection instead
+# of paying a handshake per request.
+session = requests.Session()
+
+
+def build_auth_headers(access_key: str, secret_key: str) -> dict:
+    """Build the Upbit JWT Authorization header (fresh nonce per request)."""
+    payload = {
+        "access_key": access_key,
+        "nonce": str(uuid.uuid4())
+    }
+    encoded_jwt = jwt.encode(payload, secret_key, algorithm="HS256")
+    return {"Authorization": f"Bearer {encoded_jwt}"}
+
+
+def print_accounts():
+    """Fetch and print the account balances."""
+    access_key = os.getenv("UPBIT_OPEN_API_ACCESS_KEY")
+    secret_key = os.getenv("UPBIT_OPEN_API_SECRET_KEY")
+
+    response = session.get(ACCOUNTS_URL, headers=build_auth_headers(access_key, secret_key))
+
+    if response.status_code == 200:
+        portfolio = response.json()
+        for item in portfolio:
+            print(f"Currency: {item['currency']}, Balance: {item['balance']}, Locked: {item['locked']}")
+    else:
+        print(f"Error: {response.status_code}, {response.text}")
+
+
+if __name__ == "__main__":
+    print_accounts()
+
+    # Ad-hoc order scratchpad:
+    # import pyupbit
+    # upbit = pyupbit.Upbit(
+    #     os.getenv("UPBIT_OPEN_API_ACCESS_KEY"),
+    #     os.getenv("UPBIT_OPEN_API_SECRET_KEY"),
+    # )
+    # if result["decision"] == "buy":
+    #     print("buy")
+    #     upbit.buy_market_order("KRW-ADA", current_cash)
+    # elif result["decision"] == "sell":
+    #     print("sell")
+    #     upbit.sell_market_order("KRW-ADA", current_ada)
+    # else:
+    #     print("hold")
+
+    # upbit.sell_market_order("KRW-LINK", 1)
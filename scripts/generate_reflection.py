@@ -9,8 +9,11 @@ This script:
 5. Updates the database with reflection data
 """
 
+import argparse
 import os
 import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -19,15 +22,185 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
 
 # Import after path modification (required for project structure)
-from src.functions.sql_db import get_decisions_without_reflection, update_reflection  # noqa: E402
-from src.functions.reflection import get_future_price_data, analyze_trade_result, generate_reflection  # noqa: E402
+from src.functions.sql_db import get_decisions_without_reflection, update_reflections_bulk  # noqa: E402
+from src.functions.reflection import (  # noqa: E402
+    get_future_price_data,
+    analyze_trade_result,
+    generate_reflection,
+    generate_reflections_batch,
+    prefetch_ohlcv,
+)
 
 # Load environment variables
 load_dotenv()
 
+# Flush accumulated reflection updates to the DB in batches of this size,
+# so a large backfill pays one commit per batch instead of one per trade.
+REFLECTION_FLUSH_BATCH_SIZE = 50
+
+# Trades in flight at once. Each trade is two network round-trips (Upbit
+# price history, then OpenAI), so wall time drops roughly linearly with
+# workers until OpenAI starts rate-limiting.
+MAX_WORKERS = 8
+
+
+def process_trade(trade, generate_text=True):
+    """Fetch future prices, analyze the outcome, and generate a reflection
+    for one trade.
+
+    Runs on a worker thread: only network I/O and pure computation here,
+    no printing and no DB writes. Returns a dict with either an 'error'
+    message or the analysis fields plus the 'update_row' tuple for
+    update_reflections_bulk.
+
+    With generate_text=False the OpenAI call is skipped and the analysis
+    inputs are returned instead, for the Batch API path that submits all
+    reflections in one job.
+    """
+    result = {'trade': trade, 'error': None}
+
+    # Step 1: Fetch future price data
+    future_price_data = get_future_price_data(
+        coin_name=trade['coin_name'],
+        timestamp=trade['timestamp'],
+        hours=24
+    )
+
+    if future_price_data.get('error'):
+        result['error'] = future_price_data['error']
+        return result
+
+    result['hours_available'] = future_price_data.get('hours_available', 0)
+
+    # Step 2: Analyze trade result
+    analysis = analyze_trade_result(trade, future_price_data)
+    result_type = analysis['result_type']
+    result_description = analysis['result_description']
+    profit_loss = analysis['profit_loss']
+
+    if not generate_text:
+        result['result_type'] = result_type
+        result['result_description'] = result_description
+        result['profit_loss'] = profit_loss
+        result['future_price_data'] = future_price_data
+        return result
+
+    # Step 3: Generate AI reflection
+    reflection_text = generate_reflection(
+        trade_record=trade,
+        future_price_data=future_price_data,
+        result_type=result_type,
+        result_description=result_description,
+        profit_loss=profit_loss
+    )
+
+    if reflection_text.startswith("Error"):
+        result['error'] = reflection_text
+        return result
+
+    result['result_type'] = result_type
+    result['result_description'] = result_description
+    result['profit_loss'] = profit_loss
+    result['reflection_text'] = reflection_text
+    result['update_row'] = (
+        datetime.now().isoformat(),
+        result_type,
+        result_description,
+        reflection_text,
+        profit_loss,
+        trade['id']
+    )
+    return result
+
+
+def run_batch(trades, stats):
+    """Generate reflections for all trades via one OpenAI Batch API job.
+
+    Fetch/analysis still runs on the thread pool, but all OpenAI requests
+    go up as a single batch (half the per-token price); results are
+    written with one bulk DB update when the batch completes.
+    """
+    analyzed = []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(process_trade, trade, generate_text=False): trade
+            for trade in trades
+        }
+        for i, future in enumerate(as_completed(futures), 1):
+            trade = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"[{i}/{len(trades)}] Trade ID {trade['id']}: ✗ {str(e)}")
+                stats['errors'] += 1
+                continue
+
+            if result['error']:
+                print(f"[{i}/{len(trades)}] Trade ID {trade['id']}: ✗ {result['error']}")
+                stats['errors'] += 1
+                continue
+
+            print(f"[{i}/{len(trades)}] Trade ID {trade['id']}: "
+                  f"{result['result_type'].upper()} ({result['profit_loss']*100:.2f}%)")
+            analyzed.append(result)
+
+    if not analyzed:
+        return
+
+    print(f"\nSubmitting batch of {len(analyzed)} reflection request(s)...")
+    print("(Batch API completion window is 24h; nightly backlogs usually finish in minutes)")
+    reflections = generate_reflections_batch([
+        {
+            'trade_record': r['trade'],
+            'future_price_data': r['future_price_data'],
+            'result_type': r['result_type'],
+            'result_description': r['result_description'],
+            'profit_loss': r['profit_loss']
+        }
+        for r in analyzed
+    ])
+
+    pending_updates = []
+    reflection_timestamp = datetime.now().isoformat()
+    for r in analyzed:
+        reflection_text = reflections.get(str(r['trade']['id']), '')
+        if not reflection_text or reflection_text.startswith("Error"):
+            print(f"  ✗ Trade ID {r['trade']['id']}: {reflection_text or 'no batch result'}")
+            stats['errors'] += 1
+            continue
+
+        pending_updates.append((
+            reflection_timestamp,
+            r['result_type'],
+            r['result_description'],
+            reflection_text,
+            r['profit_loss'],
+            r['trade']['id']
+        ))
+        stats['processed'] += 1
+        stats['total_profit_loss'] += r['profit_loss']
+        if r['result_type'] == 'gain':
+            stats['gains'] += 1
+        elif r['result_type'] == 'loss':
+            stats['losses'] += 1
+        else:
+            stats['neutral'] += 1
+
+    if pending_updates:
+        update_reflections_bulk(pending_updates)
+        print(f"\n✓ Flushed {len(pending_updates)} update(s) to database")
+
 
 def main():
     """Main function to generate reflections for trades."""
+    parser = argparse.ArgumentParser(description="Generate reflections for past trading decisions")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit all reflections as one OpenAI Batch API job (half price, up to 24h)"
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Trading Decision Reflection Generator")
     print("=" * 60)
@@ -44,6 +217,10 @@ def main():
     print(f"Found {len(trades)} trade(s) to analyze")
     print()
 
+    # One parallel Upbit fetch per unique coin up front; the workers
+    # below then read price data straight from the cache
+    prefetch_ohlcv([trade['coin_name'] for trade in trades], max_workers=MAX_WORKERS)
+
     # Track statistics
     stats = {
         'total': len(trades),
@@ -55,92 +232,79 @@ def main():
         'total_profit_loss': 0.0
     }
 
-    # Process each trade
-    for i, trade in enumerate(trades, 1):
-        print(f"\n[{i}/{len(trades)}] Processing trade ID {trade['id']}")
-        print(f"  Coin: {trade['coin_name']}")
-        print(f"  Decision: {trade['decision'].upper()}")
-        print(f"  Timestamp: {trade['timestamp']}")
-        print(f"  Price: {trade['coin_krw_price']:.2f} KRW")
-
-        try:
-            # Step 1: Fetch future price data
-            print("  → Fetching future price data...")
-            future_price_data = get_future_price_data(
-                coin_name=trade['coin_name'],
-                timestamp=trade['timestamp'],
-                hours=24
-            )
-
-            if future_price_data.get('error'):
-                print(f"  ✗ Error: {future_price_data['error']}")
-                stats['errors'] += 1
-                continue
+    if args.batch:
+        run_batch(trades, stats)
+        print_summary(stats)
+        return
+
+    # Updates accumulated here and flushed in batches
+    pending_updates = []
+
+    # Process trades concurrently: each one is two independent network
+    # round-trips, so up to MAX_WORKERS are in flight at once. The main
+    # thread handles progress output and DB flushes as results complete.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(process_trade, trade): trade for trade in trades}
 
-            hours_available = future_price_data.get('hours_available', 0)
-            print(f"  ✓ Retrieved {hours_available} hours of price data")
+        for i, future in enumerate(as_completed(futures), 1):
+            trade = futures[future]
+            print(f"\n[{i}/{len(trades)}] Trade ID {trade['id']}")
+            print(f"  Coin: {trade['coin_name']}")
+            print(f"  Decision: {trade['decision'].upper()}")
+            print(f"  Timestamp: {trade['timestamp']}")
+            print(f"  Price: {trade['coin_krw_price']:.2f} KRW")
 
-            if hours_available < 12:
-                print(f"  ⚠ Warning: Only {hours_available} hours available (minimum 12 recommended)")
+            try:
+                result = future.result()
 
-            # Step 2: Analyze trade result
-            print("  → Analyzing trade outcome...")
-            analysis = analyze_trade_result(trade, future_price_data)
+                if result['error']:
+                    print(f"  ✗ Error: {result['error']}")
+                    stats['errors'] += 1
+                    continue
 
-            result_type = analysis['result_type']
-            result_description = analysis['result_description']
-            profit_loss = analysis['profit_loss']
+                hours_available = result['hours_available']
+                print(f"  ✓ Retrieved {hours_available} hours of price data")
+                if hours_available < 12:
+                    print(f"  ⚠ Warning: Only {hours_available} hours available (minimum 12 recommended)")
 
-            print(f"  ✓ Result: {result_type.upper()} ({profit_loss*100:.2f}%)")
-            print(f"     {result_description}")
+                result_type = result['result_type']
+                profit_loss = result['profit_loss']
+                print(f"  ✓ Result: {result_type.upper()} ({profit_loss*100:.2f}%)")
+                print(f"     {result['result_description']}")
+                print(f"  ✓ Generated reflection ({len(result['reflection_text'])} chars)")
 
-            # Step 3: Generate AI reflection
-            print("  → Generating AI reflection...")
-            reflection_text = generate_reflection(
-                trade_record=trade,
-                future_price_data=future_price_data,
-                result_type=result_type,
-                result_description=result_description,
-                profit_loss=profit_loss
-            )
+                # Queue database update (flushed in batches)
+                pending_updates.append(result['update_row'])
+                if len(pending_updates) >= REFLECTION_FLUSH_BATCH_SIZE:
+                    update_reflections_bulk(pending_updates)
+                    print(f"  ✓ Flushed {len(pending_updates)} update(s) to database")
+                    pending_updates = []
 
-            if reflection_text.startswith("Error"):
-                print(f"  ✗ {reflection_text}")
+                # Update statistics
+                stats['processed'] += 1
+                stats['total_profit_loss'] += profit_loss
+                if result_type == 'gain':
+                    stats['gains'] += 1
+                elif result_type == 'loss':
+                    stats['losses'] += 1
+                else:
+                    stats['neutral'] += 1
+
+            except Exception as e:
+                print(f"  ✗ Unexpected error: {str(e)}")
                 stats['errors'] += 1
-                continue
+                traceback.print_exc()
+
+    # Flush whatever is left from the last partial batch
+    if pending_updates:
+        update_reflections_bulk(pending_updates)
+        print(f"\n✓ Flushed {len(pending_updates)} update(s) to database")
+
+    print_summary(stats)
 
-            print(f"  ✓ Generated reflection ({len(reflection_text)} chars)")
-
-            # Step 4: Update database
-            print("  → Updating database...")
-            reflection_timestamp = datetime.now().isoformat()
-            update_reflection(
-                record_id=trade['id'],
-                reflection_timestamp=reflection_timestamp,
-                result_type=result_type,
-                result_description=result_description,
-                reflection=reflection_text,
-                profit_loss=profit_loss
-            )
-            print("  ✓ Database updated")
-
-            # Update statistics
-            stats['processed'] += 1
-            stats['total_profit_loss'] += profit_loss
-            if result_type == 'gain':
-                stats['gains'] += 1
-            elif result_type == 'loss':
-                stats['losses'] += 1
-            else:
-                stats['neutral'] += 1
-
-        except Exception as e:
-            print(f"  ✗ Unexpected error: {str(e)}")
-            stats['errors'] += 1
-            import traceback
-            traceback.print_exc()
 
-    # Print summary statistics
+def print_summary(stats):
+    """Print the run's summary statistics."""
     print()
     print("=" * 60)
     print("SUMMARY")
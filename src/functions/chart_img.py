@@ -22,10 +22,21 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from webdriver_manager.chrome import ChromeDriverManager
+import atexit
 import time
 import os
 from datetime import datetime
 
+# Reused across calls: browser startup (~2-5s) dominates screenshot time,
+# so keep one headless Chrome alive for the lifetime of the process.
+_driver = None
+
+# Recent screenshots by URL: (output path, monotonic capture time).
+# Within SCREENSHOT_TTL_SECONDS the same URL returns the cached file
+# instead of re-rendering, so tight paper-trading loops don't recapture.
+SCREENSHOT_TTL_SECONDS = 60
+_screenshot_cache = {}
+
 
 def setup_driver():
     """
@@ -50,7 +61,41 @@ def setup_driver():
     return driver
 
 
-def take_full_page_screenshot(url, output_filename=None, width=1920):
+def _get_driver():
+    """
+    Return the shared WebDriver instance, creating or recreating it as needed.
+
+    Returns:
+        webdriver.Chrome: Live Chrome WebDriver instance
+    """
+    global _driver
+    if _driver is not None:
+        try:
+            # Cheap liveness probe; raises if the browser has died
+            _ = _driver.current_url
+            return _driver
+        except Exception:
+            _quit_driver()
+    print("Setting up Chrome WebDriver...")
+    _driver = setup_driver()
+    return _driver
+
+
+def _quit_driver():
+    """Quit the shared WebDriver instance if it exists."""
+    global _driver
+    if _driver is not None:
+        try:
+            _driver.quit()
+        except Exception:
+            pass
+        _driver = None
+
+
+atexit.register(_quit_driver)
+
+
+def take_full_page_screenshot(url, output_filename=None, width=1920, return_png_bytes=False):
     """
     Navigate to a URL and take a full-page screenshot.
 
@@ -59,16 +104,27 @@ def take_full_page_screenshot(url, output_filename=None, width=1920):
         output_filename (str, optional): Output filename for the screenshot.
                                         If None, generates timestamp-based name.
         width (int, optional): Width of the screenshot in pixels. Default is 1920.
+        return_png_bytes (bool, optional): If True, return (path, png_bytes) so
+                                        callers can encode the image without
+                                        re-reading the file from disk.
 
     Returns:
-        str: Path to the saved screenshot file
+        str: Path to the saved screenshot file, or (path, bytes) tuple
+             if return_png_bytes is True
     """
-    driver = None
+    # Serve a recent capture of the same URL from cache
+    cached = _screenshot_cache.get(url)
+    if cached is not None:
+        cached_path, cached_png, cached_at = cached
+        if time.monotonic() - cached_at < SCREENSHOT_TTL_SECONDS and os.path.exists(cached_path):
+            print(f"Reusing cached screenshot ({cached_path})")
+            if return_png_bytes:
+                return cached_path, cached_png
+            return cached_path
 
     try:
-        # Set up driver
-        print("Setting up Chrome WebDriver...")
-        driver = setup_driver()
+        # Set up (or reuse) the shared driver
+        driver = _get_driver()
 
         # Navigate to URL
         print(f"Navigating to {url}...")
@@ -191,21 +247,22 @@ def take_full_page_screenshot(url, output_filename=None, width=1920):
             # Make path absolute
             output_filename = os.path.join(project_root, output_filename)
 
-        # Take screenshot
+        # Take screenshot in memory, then archive to disk in one write
         print("Taking screenshot...")
-        driver.save_screenshot(output_filename)
+        png_bytes = driver.get_screenshot_as_png()
+        with open(output_filename, "wb") as f:
+            f.write(png_bytes)
 
         print(f"Screenshot saved successfully: {output_filename}")
 
+        _screenshot_cache[url] = (output_filename, png_bytes, time.monotonic())
 
+        if return_png_bytes:
+            return output_filename, png_bytes
         return output_filename
 
     except Exception as e:
         print(f"Error occurred: {type(e).__name__}: {e}")
+        # Discard the shared browser so the next call starts clean
+        _quit_driver()
         raise
-
-    finally:
-        # Clean up
-        if driver:
-            print("Closing browser...")
-            driver.quit()
@@ -1,7 +1,30 @@
+import io
+import time
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional, Union, Dict, List
 import pandas as pd
 
+REQUEST_TIMEOUT_SECONDS = 10
+
+# Shared session so repeated index fetches reuse the TCP/TLS connection
+# instead of paying the handshake on every request; transient upstream
+# hiccups are retried with backoff instead of surfacing as a None index.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
+))
+
+# The index updates once a day, so repeated fetches inside the trading
+# loop are redundant network I/O. Responses are cached per parameter
+# combination for FG_CACHE_TTL_SECONDS.
+FG_CACHE_TTL_SECONDS = 3600
+_fg_cache = {}
+
 
 def get_fear_greed_index(
     limit: int = 1,
@@ -57,6 +80,14 @@ def get_fear_greed_index(
     >>> csv_data = get_fear_greed_index(limit=10, format_type='csv')
     """
 
+    # Serve a recent response for the same parameters from cache
+    cache_key = (limit, format_type, date_format)
+    cached = _fg_cache.get(cache_key)
+    if cached is not None:
+        cached_data, cached_at = cached
+        if time.monotonic() - cached_at < FG_CACHE_TTL_SECONDS:
+            return cached_data
+
     # Base URL
     base_url = "https://api.alternative.me/fng/"
 
@@ -74,14 +105,17 @@ def get_fear_greed_index(
 
     try:
         # Make API request
-        response = requests.get(base_url, params=params, timeout=10)
+        response = _SESSION.get(base_url, params=params, timeout=REQUEST_TIMEOUT_SECONDS)
         response.raise_for_status()  # Raise exception for bad status codes
 
         # Return based on format
         if format_type == 'csv':
-            return response.text
+            result = response.text
         else:
-            return response.json()
+            result = orjson.loads(response.content)
+
+        _fg_cache[cache_key] = (result, time.monotonic())
+        return result
 
     except requests.exceptions.RequestException as e:
         print(f"Error fetching Fear and Greed Index: {e}")
@@ -110,6 +144,38 @@ def get_latest_fear_greed() -> Optional[Dict]:
     return None
 
 
+def get_fear_greed_csv_df(limit: int = 0) -> Optional[pd.DataFrame]:
+    """
+    Fetch the index in CSV format straight into a DataFrame.
+
+    For limit=0 (full history) the CSV body can run to multiple MB;
+    parsing response bytes directly skips the intermediate Python str
+    that response.text would materialize.
+
+    Parameters:
+    -----------
+    limit : int, optional (default=0)
+        Number of historical records to retrieve (0 for all)
+
+    Returns:
+    --------
+    Optional[pd.DataFrame]
+        DataFrame parsed from the CSV payload, or None on request error
+    """
+    try:
+        response = _SESSION.get(
+            "https://api.alternative.me/fng/",
+            params={'limit': limit, 'format': 'csv'},
+            stream=True,
+            timeout=REQUEST_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        return pd.read_csv(io.BytesIO(response.content))
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching Fear and Greed Index CSV: {e}")
+        return None
+
+
 def fear_greed_to_dataframe(limit: int = 30) -> Optional[pd.DataFrame]:
     """
     Get Fear and Greed Index data as a pandas DataFrame.
@@ -136,20 +202,21 @@ def fear_greed_to_dataframe(limit: int = 30) -> Optional[pd.DataFrame]:
     if not data or 'data' not in data:
         return None
 
-    # Convert to DataFrame
-    df = pd.DataFrame(data['data'])
-
-    # Convert timestamp to datetime
-    df['timestamp'] = pd.to_datetime(df['timestamp'].astype(int), unit='s')
-
-    # Set timestamp as index
-    df.set_index('timestamp', inplace=True)
-
-    # Convert value to numeric
-    df['value'] = pd.to_numeric(df['value'])
-
-    # Sort by date (oldest to newest)
-    df.sort_index(inplace=True)
+    # Build the columns directly instead of round-tripping through an
+    # all-object DataFrame: the API returns newest-first, so one reversed
+    # pass gives a sorted index without sort_index, values fit in uint8
+    # (0-100), and the handful of classification labels are a Categorical.
+    entries = data['data'][::-1]
+    df = pd.DataFrame(
+        {
+            'value': pd.array([int(e['value']) for e in entries], dtype='uint8'),
+            'value_classification': pd.Categorical(
+                [e['value_classification'] for e in entries]
+            ),
+        },
+        index=pd.to_datetime([int(e['timestamp']) for e in entries], unit='s'),
+    )
+    df.index.name = 'timestamp'
 
     return df
 
@@ -0,0 +1,162 @@
+"""
+Market data helpers for fetching Upbit OHLCV across multiple symbols.
+
+ai_trading currently trades a single coin, but the fetch pattern
+generalizes: scanning dozens of symbols serially through
+pyupbit.get_ohlcv would pay one network round trip per coin. These
+helpers fan the fetches out over a thread pool and expose the closes as
+a structure-of-arrays matrix so the indicator kernels can sweep the
+whole universe in one pass per indicator.
+"""
+
+import time
+
+import numpy as np
+import pyupbit
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+_keepalive_installed = False
+
+# TTL per pyupbit interval for cached_get_ohlcv, in seconds. Only the
+# newest bar of a frame is still forming, so serving a frame a few
+# minutes old changes nothing the strategy looks at; shorter intervals
+# get shorter TTLs because their forming bar moves faster.
+OHLCV_CACHE_TTLS = {"day": 300, "minute60": 120}
+OHLCV_CACHE_DEFAULT_TTL = 60
+
+# Spot prices go stale fast; only collapse back-to-back calls.
+CURRENT_PRICE_CACHE_TTL = 5
+
+_ohlcv_cache = {}
+_price_cache = {}
+
+
+def cached_get_ohlcv(ticker, interval="day", count=30):
+    """
+    pyupbit.get_ohlcv with a per-(ticker, interval, count) TTL cache.
+
+    Repeated calls inside one loop iteration (or loop iterations closer
+    together than the TTL) reuse the cached frame instead of paying
+    another Upbit round trip. Failed or empty fetches are not cached.
+    """
+    key = (ticker, interval, count)
+    cached = _ohlcv_cache.get(key)
+    ttl = OHLCV_CACHE_TTLS.get(interval, OHLCV_CACHE_DEFAULT_TTL)
+    if cached is not None and time.monotonic() - cached[1] < ttl:
+        return cached[0]
+
+    df = pyupbit.get_ohlcv(ticker, interval=interval, count=count)
+    if df is not None and not df.empty:
+        _ohlcv_cache[key] = (df, time.monotonic())
+    return df
+
+
+def cached_get_current_price(ticker):
+    """
+    pyupbit.get_current_price with a short TTL so the duplicated
+    pre-trade / post-log price reads in one run cost a single request.
+    """
+    cached = _price_cache.get(ticker)
+    if cached is not None and time.monotonic() - cached[1] < CURRENT_PRICE_CACHE_TTL:
+        return cached[0]
+
+    price = pyupbit.get_current_price(ticker)
+    if price is not None:
+        _price_cache[ticker] = (price, time.monotonic())
+    return price
+
+
+def install_pyupbit_keepalive():
+    """
+    Route pyupbit's REST calls through a pooled keep-alive session.
+
+    pyupbit.request_api calls module-level requests.get/post/delete,
+    opening a fresh TLS connection for every balance/orderbook/OHLCV
+    call. A requests.Session exposes the same get/post/delete surface,
+    so rebinding that module's `requests` name to a Session with a
+    pooled adapter makes every pyupbit call reuse connections. Safe to
+    call more than once.
+    """
+    global _keepalive_installed
+    if _keepalive_installed:
+        return
+    try:
+        import pyupbit.request_api as request_api
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        request_api.requests = session
+        _keepalive_installed = True
+    except Exception as e:
+        # pyupbit internals changed; keep the stock per-call behaviour
+        print(f"Warning: could not install pyupbit keep-alive session: {e}")
+
+
+def fetch_ohlcv_batch(
+    symbols: List[str],
+    interval: str = "day",
+    count: int = 30,
+    max_workers: int = 8
+) -> Dict[str, Optional[pd.DataFrame]]:
+    """
+    Fetch OHLCV frames for several symbols concurrently.
+
+    Args:
+        symbols: Coin symbols without the KRW- prefix (e.g. ['ADA', 'BTC'])
+        interval: pyupbit interval string (default 'day')
+        count: Number of bars per symbol (default 30)
+        max_workers: Thread pool size for parallel fetches (default 8)
+
+    Returns:
+        Dict mapping symbol to its OHLCV DataFrame, or None for symbols
+        whose fetch failed
+    """
+    if not symbols:
+        return {}
+
+    def fetch(symbol):
+        try:
+            return pyupbit.get_ohlcv(f"KRW-{symbol}", interval=interval, count=count)
+        except Exception as e:
+            print(f"Warning: OHLCV fetch failed for {symbol}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as executor:
+        frames = list(executor.map(fetch, symbols))
+
+    return dict(zip(symbols, frames))
+
+
+def closes_matrix(frames: Dict[str, Optional[pd.DataFrame]], dtype=np.float64):
+    """
+    Stack close prices from fetch_ohlcv_batch into a SoA matrix.
+
+    Symbols with missing data or a different bar count are dropped, so
+    every row of the result aligns bar-for-bar.
+
+    Args:
+        frames: Mapping of symbol to OHLCV DataFrame (None entries skipped)
+        dtype: Element type of the matrix (default float64). Pass
+            np.float32 to halve memory bandwidth for large symbol
+            universes; price indicators don't need more than ~1e-5
+            relative precision.
+
+    Returns:
+        Tuple (symbols, closes) where closes is shaped
+        [len(symbols), n_bars] and closes[i] is the close series for
+        symbols[i]
+    """
+    usable = {s: df for s, df in frames.items() if df is not None and not df.empty}
+    if not usable:
+        return [], np.empty((0, 0), dtype=dtype)
+
+    n_bars = max(len(df) for df in usable.values())
+    symbols = [s for s, df in usable.items() if len(df) == n_bars]
+    closes = np.stack([
+        usable[s]['close'].to_numpy(dtype) for s in symbols
+    ])
+    return symbols, closes
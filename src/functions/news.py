@@ -1,4 +1,7 @@
+import time
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional, Dict, List
 import pandas as pd
 import os
@@ -8,6 +11,17 @@ load_dotenv()
 
 API_KEY = os.getenv("SERP_API_KEY")
 
+# Shared session so repeated SerpAPI calls reuse the TCP/TLS connection
+# instead of paying the handshake (~1 RTT) on every request.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# News for a qdr:d window barely changes minute to minute, and every
+# SerpAPI call costs quota plus ~500ms. Summaries are cached per
+# (query, time_period, num) for NEWS_CACHE_TTL_SECONDS.
+NEWS_CACHE_TTL_SECONDS = 900
+_news_summary_cache = {}
+
 
 def get_google_news(
     query: str,
@@ -137,9 +151,11 @@ def get_google_news(
         params["sort"] = sort_by  # SerpAPI uses 'sort' instead of 'sort_by'
 
     try:
-        response = requests.get(base_url, params=params, timeout=30)
+        response = _SESSION.get(base_url, params=params, timeout=30)
         response.raise_for_status()
-        return response.json()
+        # SerpAPI payloads run 50-200KB; orjson parses them ~3x faster
+        # than requests' stdlib-json .json()
+        return orjson.loads(response.content)
 
     except requests.exceptions.RequestException as e:
         print(f"Error fetching Google News: {e}")
@@ -214,25 +230,24 @@ def news_to_dataframe(news_data: Dict, verbose: bool = False) -> Optional[pd.Dat
     if not news_data or 'news_results' not in news_data:
         return None
 
-    articles = []
+    # Build columns directly: DataFrame(list_of_dicts) re-infers the schema
+    # per column, which dwarfs the actual work at 10-20 articles
+    results = news_data['news_results']
     if verbose:
-        for article in news_data['news_results']:
-            articles.append({
-                'title': article.get('title', ''),
-                'link': article.get('link', ''),
-                'source': article.get('source', ''),
-                'date': article.get('date', ''),
-                'snippet': article.get('snippet', ''),
-                'position': article.get('position', 0)
-            })
+        columns = {
+            'title': [a.get('title', '') for a in results],
+            'link': [a.get('link', '') for a in results],
+            'source': [a.get('source', '') for a in results],
+            'date': [a.get('date', '') for a in results],
+            'snippet': [a.get('snippet', '') for a in results],
+            'position': [a.get('position', 0) for a in results],
+        }
     else:
-        for article in news_data['news_results']:
-            articles.append({
-                'title': article.get('title', ''),
-                'date': article.get('date', ''),
-            })
-    df = pd.DataFrame(articles)
-    return df
+        columns = {
+            'title': [a.get('title', '') for a in results],
+            'date': [a.get('date', '') for a in results],
+        }
+    return pd.DataFrame(columns, copy=False)
 
 
 def extract_article_summaries(news_data: Dict, max_articles: int = 10) -> List[Dict]:
@@ -311,6 +326,14 @@ def get_news_sentiment_summary(
     ... )
     >>> print(summary)
     """
+    # Serve a recent summary for the same parameters from cache
+    cache_key = (query, time_period, num)
+    cached = _news_summary_cache.get(cache_key)
+    if cached is not None:
+        cached_summary, cached_at = cached
+        if time.monotonic() - cached_at < NEWS_CACHE_TTL_SECONDS:
+            return cached_summary
+
     news = get_google_news(
         api_key=api_key,
         query=query,
@@ -324,13 +347,15 @@ def get_news_sentiment_summary(
 
     summaries = extract_article_summaries(news, max_articles=num)
 
-    # Format as text
-    text_summary = f"Recent news for '{query}' ({time_period}):\n\n"
-
-    for i, article in enumerate(summaries, 1):
-        text_summary += f"{i}. {article['title']}\n"
-        text_summary += f"   Date: {article['date']}\n\n"
+    # Format as text (single join instead of string += per article)
+    header = f"Recent news for '{query}' ({time_period}):\n\n"
+    parts = [
+        f"{i}. {article['title']}\n   Date: {article['date']}\n\n"
+        for i, article in enumerate(summaries, 1)
+    ]
+    text_summary = header + ''.join(parts)
 
+    _news_summary_cache[cache_key] = (text_summary, time.monotonic())
     return text_summary
 
 
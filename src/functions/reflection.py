@@ -1,9 +1,53 @@
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pyupbit
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, List
 from openai import OpenAI
 from pydantic import BaseModel
 
+# One 200-bar hourly fetch covers ~8 days, so every trade for the same
+# coin in a reflection backlog can share a single request. Cached per
+# coin for OHLCV_CACHE_TTL_SECONDS (the newest bar only changes hourly).
+OHLCV_CACHE_TTL_SECONDS = 3600
+_ohlcv_cache = {}
+
+
+def _fetch_ohlcv_cached(coin_name: str):
+    """Fetch 200 hourly bars for coin_name, reusing a recent result."""
+    cached = _ohlcv_cache.get(coin_name)
+    if cached is not None:
+        df, fetched_at = cached
+        if time.monotonic() - fetched_at < OHLCV_CACHE_TTL_SECONDS:
+            return df
+
+    df = pyupbit.get_ohlcv(f"KRW-{coin_name}", interval="minute60", count=200)
+    if df is not None and not df.empty:
+        _ohlcv_cache[coin_name] = (df, time.monotonic())
+    return df
+
+
+def prefetch_ohlcv(coin_names, max_workers: int = 8) -> None:
+    """Warm the per-coin OHLCV cache for a set of coins in parallel.
+
+    Call before a backlog sweep: one Upbit round-trip per unique coin,
+    overlapped on threads, so the workers that follow hit the cache
+    instead of racing duplicate fetches for the same coin.
+
+    Args:
+        coin_names: Iterable of coin names (duplicates are fine)
+        max_workers: Upper bound on concurrent Upbit requests
+    """
+    unique = sorted(set(coin_names))
+    if not unique:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as executor:
+        list(executor.map(_fetch_ohlcv_cached, unique))
+
 
 def get_future_price_data(coin_name: str, timestamp: str, hours: int = 24) -> Dict[str, Any]:
     """
@@ -41,10 +85,10 @@ def get_future_price_data(coin_name: str, timestamp: str, hours: int = 24) -> Di
         }
 
     try:
-        # Fetch hourly OHLCV data
+        # Fetch hourly OHLCV data (cached per coin, see above)
         # pyupbit.get_ohlcv returns recent data, so we need to get enough data
         # and then filter to the time range we want
-        df = pyupbit.get_ohlcv(f"KRW-{coin_name}", interval="minute60", count=200)
+        df = _fetch_ohlcv_cached(coin_name)
 
         if df is None or df.empty:
             return {
@@ -56,11 +100,16 @@ def get_future_price_data(coin_name: str, timestamp: str, hours: int = 24) -> Di
                 'error': 'No price data available'
             }
 
-        # Filter data to the future window (from trade_time to trade_time + hours)
+        # Filter data to the future window (from trade_time to trade_time + hours).
+        # Compare as int64 seconds: the bounds are converted with
+        # np.datetime64 (naive-to-naive, no local-timezone reinterpretation)
+        # and the mask is two integer compares instead of pandas coercing
+        # the scalar bound per comparison.
         end_time = trade_time + timedelta(hours=hours)
-
-        # Filter dataframe to only include data in our time range
-        mask = (df.index > trade_time) & (df.index <= end_time)
+        idx_s = df.index.values.astype('datetime64[s]').astype(np.int64)
+        ts_start = np.datetime64(trade_time, 's').astype(np.int64)
+        ts_end = np.datetime64(end_time, 's').astype(np.int64)
+        mask = (idx_s > ts_start) & (idx_s <= ts_end)
         df_filtered = df[mask]
 
         if df_filtered.empty:
@@ -73,20 +122,23 @@ def get_future_price_data(coin_name: str, timestamp: str, hours: int = 24) -> Di
                 'error': 'No data in the specified time range'
             }
 
-        # Calculate average price
-        avg_price = df_filtered['close'].mean()
-
-        # Convert to JSON-serializable format
-        ohlcv_data = []
-        for idx, row in df_filtered.iterrows():
-            ohlcv_data.append({
-                'timestamp': idx.isoformat(),
-                'open': float(row['open']),
-                'high': float(row['high']),
-                'low': float(row['low']),
-                'close': float(row['close']),
-                'volume': float(row['volume'])
-            })
+        # Convert to JSON-serializable format. One C-level pass through a
+        # float64 block instead of iterrows building a Series per bar;
+        # tolist() hands back native Python floats.
+        timestamps = df_filtered.index.strftime('%Y-%m-%dT%H:%M:%S').tolist()
+        bars = df_filtered[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64)
+        avg_price = bars[:, 3].mean()
+        ohlcv_data = [
+            {
+                'timestamp': ts,
+                'open': o,
+                'high': h,
+                'low': lo,
+                'close': c,
+                'volume': v
+            }
+            for ts, (o, h, lo, c, v) in zip(timestamps, bars.tolist())
+        ]
 
         return {
             'ohlcv_data': ohlcv_data,
@@ -134,13 +186,15 @@ def analyze_trade_result(trade_record: Dict[str, Any], future_price_data: Dict[s
             'profit_loss': 0.0
         }
 
-    # Calculate profit/loss based on decision type
-    if decision.lower() == 'hold':
+    # Calculate profit/loss based on decision type (normalized once, not
+    # per branch test)
+    decision = decision.lower()
+    if decision == 'hold':
         profit_loss = 0.0
         result_description = f"HOLD decision. Price moved from {trade_price:.2f} to {avg_future_price:.2f} KRW (avg over {hours_available}h). No trade executed."
         result_type = 'neutral'
 
-    elif decision.lower() == 'buy':
+    elif decision == 'buy':
         # For BUY: profit if price goes up
         profit_loss = (avg_future_price - trade_price) / trade_price
         price_change_pct = profit_loss * 100
@@ -155,7 +209,7 @@ def analyze_trade_result(trade_record: Dict[str, Any], future_price_data: Dict[s
             result_type = 'neutral'
             result_description = f"BUY at {trade_price:.2f} KRW. Price remained stable at {avg_future_price:.2f} KRW (avg over {hours_available}h). Change: {price_change_pct:.2f}%"
 
-    elif decision.lower() == 'sell':
+    elif decision == 'sell':
         # For SELL: profit if price goes down (you sold before the drop)
         profit_loss = (trade_price - avg_future_price) / trade_price
         price_change_pct = -profit_loss * 100  # Show actual price movement
@@ -183,34 +237,100 @@ def analyze_trade_result(trade_record: Dict[str, Any], future_price_data: Dict[s
     }
 
 
+def analyze_trade_results_bulk(decisions, trade_prices, avg_future_prices, hours_available):
+    """
+    Vectorized analyze_trade_result over parallel arrays.
+
+    Applies the same profit/loss formulas and +/-1% thresholds as
+    analyze_trade_result, but in a handful of NumPy sweeps instead of one
+    Python call per record — meant for backlog analytics over thousands
+    of rows. Descriptions are not generated here; callers that need them
+    can format from the returned arrays.
+
+    Args:
+        decisions: Sequence of decision strings ('buy'/'sell'/'hold')
+        trade_prices: Sequence of trade prices in KRW
+        avg_future_prices: Sequence of average future prices (NaN where
+                           no future data was available)
+        hours_available: Sequence of hours of future data per record
+
+    Returns:
+        Tuple of (result_types, profit_loss) numpy arrays, where
+        result_types holds 'gain'/'loss'/'neutral' strings
+    """
+    decisions = np.char.lower(np.asarray(decisions, dtype=str))
+    trade_prices = np.asarray(trade_prices, dtype=np.float64)
+    avg_future = np.asarray(avg_future_prices, dtype=np.float64)
+    hours = np.asarray(hours_available, dtype=np.int64)
+
+    valid = (hours > 0) & ~np.isnan(avg_future)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        profit_loss = np.where(
+            valid & (decisions == 'buy'),
+            (avg_future - trade_prices) / trade_prices,
+            np.where(
+                valid & (decisions == 'sell'),
+                (trade_prices - avg_future) / trade_prices,
+                0.0
+            )
+        )
+    profit_loss = np.nan_to_num(profit_loss, nan=0.0, posinf=0.0, neginf=0.0)
+
+    result_types = np.select(
+        [~valid, profit_loss > 0.01, profit_loss < -0.01],
+        ['neutral', 'gain', 'loss'],
+        default='neutral'
+    )
+    return result_types, profit_loss
+
+
 class ReflectionOutput(BaseModel):
     """Structured output for reflection generation"""
     reflection: str
 
 
-def generate_reflection(
+REFLECTION_MODEL = "gpt-4o-2024-08-06"
+
+# The system message carries everything that never varies between trades
+# (role + task instructions), so the request prefix is byte-identical
+# across a backlog run and eligible for OpenAI prompt caching; only the
+# per-trade context below changes.
+REFLECTION_SYSTEM_PROMPT = """You are an expert cryptocurrency trading analyst reviewing past trading decisions. Provide thoughtful, analytical reflections. Be specific about what worked and what didn't, and extract actionable lessons.
+
+For each trade you are shown, reflect on the decision. Consider:
+1. **Decision Quality**: Was the reasoning sound? Did it align with good trading principles?
+2. **Outcome Analysis**: What factors led to this outcome? Were there signals that were correctly identified or missed?
+3. **Confidence Calibration**: Was the confidence score appropriate given the market conditions?
+4. **Key Lessons**: What can be learned from this trade for future decisions?
+
+Be specific, analytical, and constructive. Focus on actionable insights."""
+
+# JSON-schema equivalent of ReflectionOutput for the Batch API, which
+# takes raw request bodies rather than the parse() helper
+_REFLECTION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "reflection_output",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {"reflection": {"type": "string"}},
+            "required": ["reflection"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def _build_reflection_prompt(
     trade_record: Dict[str, Any],
     future_price_data: Dict[str, Any],
     result_type: str,
     result_description: str,
     profit_loss: float
 ) -> str:
-    """
-    Generate AI-powered reflection on a trade decision.
-
-    Args:
-        trade_record: Dictionary containing the original trade decision
-        future_price_data: Dictionary containing future price data
-        result_type: Type of result ('gain', 'loss', 'neutral')
-        result_description: Description of the outcome
-        profit_loss: Percentage profit/loss as decimal
-
-    Returns:
-        Reflection text analyzing what went right or wrong
-    """
-    client = OpenAI()
-
-    # Prepare the context
+    """Build the user prompt shared by the sync and batch reflection paths."""
     decision = trade_record['decision']
     reason = trade_record['reason']
     confidence_score = trade_record.get('confidence_score', 0)
@@ -218,19 +338,22 @@ def generate_reflection(
     trade_price = trade_record['coin_krw_price']
     timestamp = trade_record['timestamp']
 
-    # Format future price data for readability
+    # Compact CSV block instead of prose per hour: same information in
+    # roughly a third of the tokens, which multiplies across backlog runs
     ohlcv_summary = ""
     if future_price_data.get('ohlcv_data'):
         ohlcv_list = future_price_data['ohlcv_data']
-        ohlcv_summary = f"\nPrice movement over {len(ohlcv_list)} hours:"
-        for i, data in enumerate(ohlcv_list[:5]):  # Show first 5 hours
-            ohlcv_summary += f"\n  Hour {i+1}: Close {data['close']:.2f} KRW"
-        if len(ohlcv_list) > 5:
-            ohlcv_summary += f"\n  ... ({len(ohlcv_list) - 5} more hours)"
-
-    prompt = f"""You are an expert trading analyst reviewing a past trading decision. Provide a thoughtful reflection on what happened.
+        closes = [data['close'] for data in ohlcv_list]
+        rows = '\n'.join(f"{i},{data['close']:.0f}" for i, data in enumerate(ohlcv_list[:5], 1))
+        ohlcv_summary = (
+            f"\nClose prices (KRW) for the first hours:\nhour,close\n{rows}\n"
+            f"All {len(closes)} hours: min {min(closes):.0f}, "
+            f"max {max(closes):.0f}, mean {sum(closes) / len(closes):.0f} KRW"
+        )
 
-### Original Trade Decision
+    # Only per-trade context here; the task instructions live in the
+    # (stable) system prompt
+    return f"""### Original Trade Decision
 - Coin: {coin_name}
 - Decision: {decision.upper()}
 - Trade Price: {trade_price:.2f} KRW
@@ -242,24 +365,42 @@ def generate_reflection(
 - Result: {result_type.upper()}
 - Profit/Loss: {profit_loss*100:.2f}%
 - Description: {result_description}
-{ohlcv_summary}
+{ohlcv_summary}"""
 
-### Your Task
-Reflect on this trade decision. Consider:
-1. **Decision Quality**: Was the reasoning sound? Did it align with good trading principles?
-2. **Outcome Analysis**: What factors led to this outcome? Were there signals that were correctly identified or missed?
-3. **Confidence Calibration**: Was the confidence score appropriate given the market conditions?
-4. **Key Lessons**: What can be learned from this trade for future decisions?
 
-Be specific, analytical, and constructive. Focus on actionable insights."""
+def generate_reflection(
+    trade_record: Dict[str, Any],
+    future_price_data: Dict[str, Any],
+    result_type: str,
+    result_description: str,
+    profit_loss: float
+) -> str:
+    """
+    Generate AI-powered reflection on a trade decision.
+
+    Args:
+        trade_record: Dictionary containing the original trade decision
+        future_price_data: Dictionary containing future price data
+        result_type: Type of result ('gain', 'loss', 'neutral')
+        result_description: Description of the outcome
+        profit_loss: Percentage profit/loss as decimal
+
+    Returns:
+        Reflection text analyzing what went right or wrong
+    """
+    client = OpenAI()
+
+    prompt = _build_reflection_prompt(
+        trade_record, future_price_data, result_type, result_description, profit_loss
+    )
 
     try:
         response = client.chat.completions.parse(
-            model="gpt-4o-2024-08-06",
+            model=REFLECTION_MODEL,
             messages=[
                 {
                     "role": "system",
-                    "content": "You are an expert cryptocurrency trading analyst. Provide thoughtful, analytical reflections on trading decisions. Be specific about what worked and what didn't, and extract actionable lessons."
+                    "content": REFLECTION_SYSTEM_PROMPT
                 },
                 {
                     "role": "user",
@@ -274,3 +415,103 @@ Be specific, analytical, and constructive. Focus on actionable insights."""
 
     except Exception as e:
         return f"Error generating reflection: {str(e)}"
+
+
+def generate_reflections_batch(
+    records: List[Dict[str, Any]],
+    poll_interval: int = 30
+) -> Dict[str, str]:
+    """
+    Generate reflections for many trades with one OpenAI Batch API job.
+
+    Batched requests cost half the synchronous per-token price and avoid
+    one round-trip per trade, at the cost of waiting for the batch to
+    finish (completion window is 24h, nightly backlogs typically clear in
+    minutes). Use this for large backfills; generate_reflection stays the
+    low-latency single-trade path.
+
+    Args:
+        records: List of dicts, each with the keys generate_reflection
+                 takes: trade_record, future_price_data, result_type,
+                 result_description, profit_loss
+        poll_interval: Seconds between batch status polls
+
+    Returns:
+        Dict mapping str(trade id) to reflection text (or an
+        "Error generating reflection: ..." string per failed record)
+    """
+    if not records:
+        return {}
+
+    client = OpenAI()
+
+    lines = []
+    for record in records:
+        prompt = _build_reflection_prompt(
+            record['trade_record'],
+            record['future_price_data'],
+            record['result_type'],
+            record['result_description'],
+            record['profit_loss']
+        )
+        lines.append(json.dumps({
+            "custom_id": str(record['trade_record']['id']),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": REFLECTION_MODEL,
+                "messages": [
+                    {"role": "system", "content": REFLECTION_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                "response_format": _REFLECTION_RESPONSE_FORMAT
+            }
+        }))
+
+    try:
+        batch_file = client.files.create(
+            file=io.BytesIO("\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            error_text = f"Error generating reflection: batch {batch.status}"
+            return {
+                str(r['trade_record']['id']): error_text for r in records
+            }
+
+        results = {}
+        output = client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            parsed = json.loads(line)
+            custom_id = parsed.get('custom_id')
+            response = parsed.get('response') or {}
+            if response.get('status_code') == 200:
+                content = response['body']['choices'][0]['message']['content']
+                results[custom_id] = ReflectionOutput.model_validate_json(content).reflection
+            else:
+                error = parsed.get('error') or response.get('body')
+                results[custom_id] = f"Error generating reflection: {error}"
+
+        # Records the batch dropped entirely still get an error string
+        for record in records:
+            results.setdefault(
+                str(record['trade_record']['id']),
+                "Error generating reflection: missing from batch output"
+            )
+        return results
+
+    except Exception as e:
+        error_text = f"Error generating reflection: {str(e)}"
+        return {str(r['trade_record']['id']): error_text for r in records}
@@ -1,4 +1,5 @@
 import sqlite3
+import threading
 from datetime import datetime
 from typing import Optional
 import os
@@ -10,6 +11,74 @@ PROJECT_ROOT = os.path.dirname(SRC_DIR)
 DB_DIR = os.path.join(PROJECT_ROOT, "database")
 DB_PATH = os.path.join(DB_DIR, "trade_log.db")
 
+# One long-lived writer connection per database path, so the schema
+# check and PRAGMA setup in init_db run once per process instead of on
+# every insert/update. Guarded by _write_lock: the connections are opened
+# with check_same_thread=False so thread-pool callers can share them, and
+# the lock serializes their transactions (short point reads included).
+# Long scans (iter_all_decisions, the DataFrame export) keep their own
+# connections so they never hold the lock across a large result set.
+_write_connections = {}
+_write_lock = threading.Lock()
+
+# Bumped whenever init_db's schema/migration block changes. Databases at
+# this version skip the CREATE TABLE / table_info / index DDL entirely,
+# so reopening the DB is two pragma statements.
+SCHEMA_VERSION = 2
+
+# Shared INSERT text: keeping the exact same SQL string lets SQLite reuse
+# the prepared statement from the connection's statement cache instead of
+# re-parsing it on every call.
+_INSERT_DECISION_SQL = """
+    INSERT INTO trading_decisions
+    (timestamp, decision, confidence_score, reason, coin_name, coin_balance,
+     krw_balance, coin_avg_buy_price, coin_krw_price, trade_amount, is_real_trade)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPDATE_REFLECTION_SQL = """
+    UPDATE trading_decisions
+    SET reflection_timestamp = ?,
+        result_type = ?,
+        result_description = ?,
+        reflection = ?,
+        profit_loss = ?
+    WHERE id = ?
+"""
+
+
+def _get_write_connection(db_path: str) -> sqlite3.Connection:
+    """Return the cached writer connection for db_path, creating it via
+    init_db on first use."""
+    conn = _write_connections.get(db_path)
+    if conn is None:
+        conn = init_db(db_path)
+        _write_connections[db_path] = conn
+    return conn
+
+def connect_readonly(db_path: str = DB_PATH) -> sqlite3.Connection:
+    """
+    Open a read-only connection tuned for the dashboard loaders.
+
+    mode=ro skips the write-lock machinery entirely, and mmap_size lets
+    page reads go through the OS page cache instead of read() syscalls.
+    immutable=1 is deliberately NOT used: the trading bot appends to this
+    file while dashboards render, and immutable mode lets SQLite cache
+    pages of a file it assumes never changes.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        Read-only connection to the database
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.executescript("""
+        PRAGMA busy_timeout=2000;
+        PRAGMA mmap_size=268435456;
+    """)
+    return conn
+
 def init_db(db_path: str = DB_PATH) -> sqlite3.Connection:
     """
     Initialize the SQLite database and create the table if it doesn't exist.
@@ -20,7 +89,25 @@ def init_db(db_path: str = DB_PATH) -> sqlite3.Connection:
     Returns:
         Connection to the database
     """
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+
+    # WAL lets the Streamlit dashboards read while a trade/reflection is
+    # being written; synchronous=NORMAL (safe under WAL) cuts per-commit
+    # fsyncs; busy_timeout avoids spurious SQLITE_BUSY between processes;
+    # mmap_size serves page reads from the OS page cache without copies.
+    conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA busy_timeout=5000;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-20000;
+        PRAGMA mmap_size=268435456;
+    """)
+
+    # Fast path: schema already migrated, skip the DDL below
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return conn
+
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -61,6 +148,26 @@ def init_db(db_path: str = DB_PATH) -> sqlite3.Connection:
     if 'profit_loss' not in columns:
         cursor.execute("ALTER TABLE trading_decisions ADD COLUMN profit_loss REAL")
 
+    # Indexes for the dashboard queries (ORDER BY timestamp DESC, coin
+    # filters) and the reflection backfill (pending-reflection scan); the
+    # partial index matches the predicate used by
+    # get_decisions_without_reflection.
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_td_timestamp
+        ON trading_decisions(timestamp DESC)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_td_coin_timestamp
+        ON trading_decisions(coin_name, timestamp DESC)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_td_reflection_pending
+        ON trading_decisions(timestamp)
+        WHERE reflection = '' OR reflection IS NULL
+    """)
+    cursor.execute("ANALYZE")
+
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
     return conn
 
@@ -101,37 +208,64 @@ def insert_decision(
     if timestamp is None:
         timestamp = datetime.now().isoformat()
 
-    conn = init_db(db_path)
-    cursor = conn.cursor()
-
     # Convert boolean to integer for SQLite (True -> 1, False -> 0)
     is_real_trade_int = 1 if is_real_trade else 0 if is_real_trade is False else None
 
-    cursor.execute("""
-        INSERT INTO trading_decisions
-        (timestamp, decision, confidence_score, reason, coin_name, coin_balance,
-         krw_balance, coin_avg_buy_price, coin_krw_price, trade_amount, is_real_trade)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        timestamp,
-        decision,
-        confidence_score,
-        reason,
-        coin_name,
-        coin_balance,
-        krw_balance,
-        coin_avg_buy_price,
-        coin_krw_price,
-        trade_amount,
-        is_real_trade_int
-    ))
-
-    record_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    with _write_lock:
+        conn = _get_write_connection(db_path)
+
+        # conn.execute binds straight onto the cached prepared statement
+        # (same SQL string object every call) without an extra Python-level
+        # cursor allocation
+        cursor = conn.execute(_INSERT_DECISION_SQL, (
+            timestamp,
+            decision,
+            confidence_score,
+            reason,
+            coin_name,
+            coin_balance,
+            krw_balance,
+            coin_avg_buy_price,
+            coin_krw_price,
+            trade_amount,
+            is_real_trade_int
+        ))
+
+        record_id = cursor.lastrowid
+        conn.commit()
 
     return record_id
 
+def insert_decisions_bulk(
+    rows: list,
+    db_path: str = DB_PATH
+) -> None:
+    """
+    Insert many trading decision records in one transaction.
+
+    Meant for callers that log decisions in volume (backtests, simulated
+    runs): one commit covers the batch instead of one per row.
+
+    Args:
+        rows: List of tuples matching insert_decision's column order:
+              (timestamp, decision, confidence_score, reason, coin_name,
+               coin_balance, krw_balance, coin_avg_buy_price,
+               coin_krw_price, trade_amount, is_real_trade)
+        db_path: Path to the SQLite database file
+    """
+    if not rows:
+        return
+
+    with _write_lock:
+        conn = _get_write_connection(db_path)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(_INSERT_DECISION_SQL, rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
 def get_recent_decisions(
     limit: int = 10,
     coin_name: Optional[str] = None,
@@ -148,28 +282,71 @@ def get_recent_decisions(
     Returns:
         List of dictionaries containing decision records
     """
+    with _write_lock:
+        conn = _get_write_connection(db_path)
+        conn.row_factory = sqlite3.Row
+
+        if coin_name:
+            rows = conn.execute("""
+                SELECT * FROM trading_decisions
+                WHERE coin_name = ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+            """, (coin_name, limit)).fetchall()
+        else:
+            rows = conn.execute("""
+                SELECT * FROM trading_decisions
+                ORDER BY timestamp DESC
+                LIMIT ?
+            """, (limit,)).fetchall()
+
+    return [dict(row) for row in rows]
+
+def iter_all_decisions(
+    coin_name: Optional[str] = None,
+    db_path: str = DB_PATH,
+    batch_size: int = 1000
+):
+    """
+    Iterate over all trading decisions without loading the table at once.
+
+    Rows are fetched in batches of batch_size and yielded one dict at a
+    time, so memory stays O(batch) however large the log grows and
+    consumers can start on the first batch while SQLite scans the rest.
+
+    Args:
+        coin_name: Optional filter by coin name
+        db_path: Path to the SQLite database file
+        batch_size: Rows fetched from SQLite per round-trip
+
+    Yields:
+        Dictionaries containing decision records, newest first
+    """
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    try:
+        cursor = conn.cursor()
 
-    if coin_name:
-        cursor.execute("""
-            SELECT * FROM trading_decisions
-            WHERE coin_name = ?
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """, (coin_name, limit))
-    else:
-        cursor.execute("""
-            SELECT * FROM trading_decisions
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """, (limit,))
-
-    rows = cursor.fetchall()
-    conn.close()
+        if coin_name:
+            cursor.execute("""
+                SELECT * FROM trading_decisions
+                WHERE coin_name = ?
+                ORDER BY timestamp DESC
+            """, (coin_name,))
+        else:
+            cursor.execute("""
+                SELECT * FROM trading_decisions
+                ORDER BY timestamp DESC
+            """)
 
-    return [dict(row) for row in rows]
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            for row in batch:
+                yield dict(row)
+    finally:
+        conn.close()
 
 def get_all_decisions(
     coin_name: Optional[str] = None,
@@ -178,6 +355,9 @@ def get_all_decisions(
     """
     Retrieve all trading decisions from the database.
 
+    Thin list() wrapper around iter_all_decisions; prefer the iterator
+    for large logs.
+
     Args:
         coin_name: Optional filter by coin name
         db_path: Path to the SQLite database file
@@ -185,26 +365,58 @@ def get_all_decisions(
     Returns:
         List of dictionaries containing decision records
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    return list(iter_all_decisions(coin_name=coin_name, db_path=db_path))
 
-    if coin_name:
-        cursor.execute("""
-            SELECT * FROM trading_decisions
-            WHERE coin_name = ?
-            ORDER BY timestamp DESC
-        """, (coin_name,))
-    else:
-        cursor.execute("""
-            SELECT * FROM trading_decisions
-            ORDER BY timestamp DESC
-        """)
-
-    rows = cursor.fetchall()
-    conn.close()
+def get_all_decisions_df(
+    coin_name: Optional[str] = None,
+    db_path: str = DB_PATH
+):
+    """
+    Retrieve all trading decisions as a typed pandas DataFrame.
 
-    return [dict(row) for row in rows]
+    Analytics callers should prefer this over looping analyze-style
+    functions across get_all_decisions dicts: the columns come back as
+    numpy-backed arrays, so profit/loss math and result bucketing can run
+    as vector ops (e.g. reflection.analyze_trade_results_bulk) instead of
+    per-row Python float arithmetic.
+
+    Args:
+        coin_name: Optional filter by coin name
+        db_path: Path to the SQLite database file
+
+    Returns:
+        DataFrame of decision records, newest first, with parsed
+        timestamps and float64/Int8 numeric columns
+    """
+    import pandas as pd
+
+    conn = connect_readonly(db_path)
+    try:
+        if coin_name:
+            query = "SELECT * FROM trading_decisions WHERE coin_name = ? ORDER BY timestamp DESC"
+            params = (coin_name,)
+        else:
+            query = "SELECT * FROM trading_decisions ORDER BY timestamp DESC"
+            params = None
+
+        return pd.read_sql_query(
+            query,
+            conn,
+            params=params,
+            parse_dates=["timestamp", "reflection_timestamp"],
+            dtype={
+                "is_real_trade": "Int8",
+                "confidence_score": "Float64",
+                "profit_loss": "Float64",
+                "coin_balance": "Float64",
+                "krw_balance": "Float64",
+                "coin_avg_buy_price": "Float64",
+                "coin_krw_price": "Float64",
+                "trade_amount": "Float64",
+            },
+        )
+    finally:
+        conn.close()
 
 def get_decisions_without_reflection(
     coin_name: Optional[str] = None,
@@ -222,47 +434,44 @@ def get_decisions_without_reflection(
     Returns:
         List of dictionaries containing decision records without reflection
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
-    # Calculate the cutoff timestamp
-    if min_hours_old:
-        from datetime import datetime, timedelta
-        cutoff_time = (datetime.now() - timedelta(hours=min_hours_old)).isoformat()
-
-        if coin_name:
-            cursor.execute("""
-                SELECT * FROM trading_decisions
-                WHERE coin_name = ?
-                AND (reflection = '' OR reflection IS NULL)
-                AND timestamp < ?
-                ORDER BY timestamp ASC
-            """, (coin_name, cutoff_time))
-        else:
-            cursor.execute("""
-                SELECT * FROM trading_decisions
-                WHERE (reflection = '' OR reflection IS NULL)
-                AND timestamp < ?
-                ORDER BY timestamp ASC
-            """, (cutoff_time,))
-    else:
-        if coin_name:
-            cursor.execute("""
-                SELECT * FROM trading_decisions
-                WHERE coin_name = ?
-                AND (reflection = '' OR reflection IS NULL)
-                ORDER BY timestamp ASC
-            """, (coin_name,))
+    with _write_lock:
+        conn = _get_write_connection(db_path)
+        conn.row_factory = sqlite3.Row
+
+        # Calculate the cutoff timestamp
+        if min_hours_old:
+            from datetime import datetime, timedelta
+            cutoff_time = (datetime.now() - timedelta(hours=min_hours_old)).isoformat()
+
+            if coin_name:
+                rows = conn.execute("""
+                    SELECT * FROM trading_decisions
+                    WHERE coin_name = ?
+                    AND (reflection = '' OR reflection IS NULL)
+                    AND timestamp < ?
+                    ORDER BY timestamp ASC
+                """, (coin_name, cutoff_time)).fetchall()
+            else:
+                rows = conn.execute("""
+                    SELECT * FROM trading_decisions
+                    WHERE (reflection = '' OR reflection IS NULL)
+                    AND timestamp < ?
+                    ORDER BY timestamp ASC
+                """, (cutoff_time,)).fetchall()
         else:
-            cursor.execute("""
-                SELECT * FROM trading_decisions
-                WHERE (reflection = '' OR reflection IS NULL)
-                ORDER BY timestamp ASC
-            """)
-
-    rows = cursor.fetchall()
-    conn.close()
+            if coin_name:
+                rows = conn.execute("""
+                    SELECT * FROM trading_decisions
+                    WHERE coin_name = ?
+                    AND (reflection = '' OR reflection IS NULL)
+                    ORDER BY timestamp ASC
+                """, (coin_name,)).fetchall()
+            else:
+                rows = conn.execute("""
+                    SELECT * FROM trading_decisions
+                    WHERE (reflection = '' OR reflection IS NULL)
+                    ORDER BY timestamp ASC
+                """).fetchall()
 
     return [dict(row) for row in rows]
 
@@ -287,21 +496,43 @@ def update_reflection(
         profit_loss: Percentage profit/loss as decimal (e.g., 0.10 for 10%)
         db_path: Path to the SQLite database file
     """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    with _write_lock:
+        conn = _get_write_connection(db_path)
+        cursor = conn.cursor()
 
-    cursor.execute("""
-        UPDATE trading_decisions
-        SET reflection_timestamp = ?,
-            result_type = ?,
-            result_description = ?,
-            reflection = ?,
-            profit_loss = ?
-        WHERE id = ?
-    """, (reflection_timestamp, result_type, result_description, reflection, profit_loss, record_id))
+        cursor.execute(_UPDATE_REFLECTION_SQL,
+                       (reflection_timestamp, result_type, result_description, reflection, profit_loss, record_id))
 
-    conn.commit()
-    conn.close()
+        conn.commit()
+
+def update_reflections_bulk(
+    rows: list,
+    db_path: str = DB_PATH
+) -> None:
+    """
+    Update reflection fields for many records in one transaction.
+
+    One commit (one fsync) covers the whole batch instead of one per row,
+    which is what dominates a backfill of thousands of reflections.
+
+    Args:
+        rows: List of tuples matching update_reflection's column order:
+              (reflection_timestamp, result_type, result_description,
+               reflection, profit_loss, record_id)
+        db_path: Path to the SQLite database file
+    """
+    if not rows:
+        return
+
+    with _write_lock:
+        conn = _get_write_connection(db_path)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(_UPDATE_REFLECTION_SQL, rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
 
 if __name__ == "__main__":
     # Example usage
@@ -7,124 +7,410 @@ using the youtube-transcript-api library.
 Documentation: https://pypi.org/project/youtube-transcript-api/
 """
 
+import asyncio
+import functools
+import logging
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pickle
 import re
+import sqlite3
+import threading
+import time
+from types import MappingProxyType
 from typing import Optional
+from urllib.parse import urlparse, parse_qs
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound, VideoUnavailable
 
+logger = logging.getLogger(__name__)
+
+# Cached transcript entries: a namedtuple is a fraction of the size of
+# the 3-key dict to_raw_data builds per entry, which matters when the
+# lru_cache holds hundreds of multi-thousand-entry transcripts.
+Snippet = namedtuple('Snippet', 'text start duration')
+
+
+def snippets_to_raw_data(snippets) -> list:
+    """Convert Snippet tuples back to the list-of-dicts shape of
+    FetchedTranscript.to_raw_data(), for callers that need dicts."""
+    return [{'text': s.text, 'start': s.start, 'duration': s.duration} for s in snippets]
+
+# On-disk transcript cache: transcripts don't change once published, so
+# fetches survive process restarts (the lru_cache above them only lives
+# for one run). Stored next to the trade log in database/.
+_FUNCTIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(_FUNCTIONS_DIR))
+_CACHE_DB_PATH = os.path.join(_PROJECT_ROOT, "database", "transcript_cache.db")
+
+_CACHE_TTL_SECONDS = 30 * 24 * 3600
+# Failed lookups (no transcript, disabled, unavailable) are remembered
+# too, but briefly — a transcript may appear later
+_NEGATIVE_CACHE_TTL_SECONDS = 3600
+_CACHE_MAX_ROWS = 1000
+
+_cache_conn = None
+_cache_lock = threading.Lock()
+
+
+def _get_cache_conn() -> sqlite3.Connection:
+    """Return the shared cache connection, creating the table on first use."""
+    global _cache_conn
+    if _cache_conn is None:
+        os.makedirs(os.path.dirname(_CACHE_DB_PATH), exist_ok=True)
+        conn = sqlite3.connect(_CACHE_DB_PATH, check_same_thread=False)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS transcript_cache (
+                key TEXT PRIMARY KEY,
+                fetched_at INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'ok',
+                payload BLOB
+            )
+        """)
+        # Add the status column to caches created before it existed
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(transcript_cache)")]
+        if 'status' not in columns:
+            conn.execute("ALTER TABLE transcript_cache ADD COLUMN status TEXT NOT NULL DEFAULT 'ok'")
+        conn.commit()
+        _cache_conn = conn
+    return _cache_conn
+
+
+def _disk_cache_get(key: str) -> Optional[tuple]:
+    """Return a fresh (status, payload) cache entry for key, or None.
+
+    status 'ok' carries the transcript payload; 'missing' marks a cached
+    negative result (payload None). Negative entries expire on the
+    shorter TTL.
+    """
+    with _cache_lock:
+        conn = _get_cache_conn()
+        row = conn.execute(
+            "SELECT status, payload, fetched_at FROM transcript_cache WHERE key = ?",
+            (key,),
+        ).fetchone()
+    if row is None:
+        return None
+    status, payload, fetched_at = row
+    ttl = _CACHE_TTL_SECONDS if status == 'ok' else _NEGATIVE_CACHE_TTL_SECONDS
+    if fetched_at <= int(time.time()) - ttl:
+        return None
+    if status != 'ok':
+        return (status, None)
+    try:
+        return ('ok', pickle.loads(payload))
+    except Exception:
+        return None
+
+
+def _disk_cache_put(key: str, result: Optional[dict], status: str = 'ok') -> None:
+    """Store result for key, trimming the oldest rows past the cap."""
+    payload = pickle.dumps(result) if result is not None else None
+    with _cache_lock:
+        conn = _get_cache_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO transcript_cache (key, fetched_at, status, payload) VALUES (?, ?, ?, ?)",
+            (key, int(time.time()), status, payload),
+        )
+        conn.execute(
+            """
+            DELETE FROM transcript_cache WHERE key NOT IN (
+                SELECT key FROM transcript_cache ORDER BY fetched_at DESC LIMIT ?
+            )
+            """,
+            (_CACHE_MAX_ROWS,),
+        )
+        conn.commit()
+
+# Compiled once at import; a single alternation covers all supported URL
+# forms in one scan instead of two sequential patterns (the (?:.*&)? arm
+# handles watch URLs where v= isn't the first query parameter).
+_VIDEO_ID_RE = re.compile(
+    r'(?:youtube\.com\/watch\?(?:.*&)?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})'
+)
+
+# Shape check for candidates produced by the urlparse fast path
+_VIDEO_ID_SHAPE_RE = re.compile(r'^[a-zA-Z0-9_-]{11}$')
+
 
 def extract_video_id(url: str) -> Optional[str]:
     """
     Extract video ID from various YouTube URL formats.
 
+    Three tiers, cheapest first: a str.find plus constant-length slice
+    for the dominant v=/youtu.be/embed forms, urllib.parse for URLs the
+    slice can't place, and the compiled regex only for pathological
+    inputs.
+
     Args:
         url: YouTube video URL
 
     Returns:
         Video ID if found, None otherwise
     """
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
-        r'youtube\.com\/watch\?.*v=([a-zA-Z0-9_-]{11})',
-    ]
+    i = url.find('v=')
+    if i > 0 and url[i - 1] in '?&':
+        candidate = url[i + 2:i + 13]
+        if _VIDEO_ID_SHAPE_RE.match(candidate):
+            return candidate
+    for marker in ('youtu.be/', '/embed/'):
+        i = url.find(marker)
+        if i >= 0:
+            start = i + len(marker)
+            candidate = url[start:start + 11]
+            if _VIDEO_ID_SHAPE_RE.match(candidate):
+                return candidate
+
+    parsed = urlparse(url)
+    candidate = None
+
+    if parsed.hostname and parsed.hostname.endswith('youtu.be'):
+        candidate = parsed.path.lstrip('/')[:11]
+    elif parsed.path == '/watch':
+        candidate = parse_qs(parsed.query).get('v', [None])[0]
+    elif parsed.path.startswith('/embed/'):
+        candidate = parsed.path[len('/embed/'):][:11]
+
+    if candidate and _VIDEO_ID_SHAPE_RE.match(candidate):
+        return candidate
 
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
 
 
 def get_transcript(video_url: str, languages: Optional[list] = None) -> Optional[dict]:
     """
     Fetch transcript for a YouTube video.
 
+    Repeat requests for the same video and language preference are served
+    from an in-process LRU cache instead of re-hitting YouTube.
+
     Args:
         video_url: YouTube video URL
         languages: List of language codes (e.g., ['en', 'ko']).
                    If None, tries to fetch in any available language.
 
     Returns:
-        Dictionary with 'text' (full transcript), 'transcript' (list of dicts),
-        'video_id', 'language', 'language_code', and 'is_generated',
-        or None if transcript cannot be fetched
+        Read-only mapping with 'text' (full transcript), 'transcript'
+        (tuple of Snippet namedtuples; see snippets_to_raw_data for the
+        dict shape), 'video_id', 'language', 'language_code', and
+        'is_generated', or None if transcript cannot be fetched. The
+        mapping is shared with the cache — copy with dict(...) if you
+        need to mutate it.
     """
     video_id = extract_video_id(video_url)
 
     if not video_id:
-        print(f"Error: Could not extract video ID from URL: {video_url}")
+        logger.error("Could not extract video ID from URL: %s", video_url)
+        return None
+
+    return _get_transcript_cached(video_id, tuple(languages) if languages else None)
+
+
+# Shared API instance: each YouTubeTranscriptApi owns a requests.Session,
+# so a per-call instance discards its connection pool and TLS session
+# between fetches. Lazy so importing the module stays cheap.
+_ytt_api = None
+
+
+def _get_ytt_api() -> YouTubeTranscriptApi:
+    global _ytt_api
+    if _ytt_api is None:
+        _ytt_api = YouTubeTranscriptApi()
+    return _ytt_api
+
+
+def _list_available(ytt_api, video_id: str) -> Optional[list]:
+    """List a video's available transcripts, or None if listing fails."""
+    try:
+        available = list(ytt_api.list(video_id))
+    except Exception as e:
+        logger.error("Could not list transcripts for video %s: %s", video_id, e)
+        return None
+    if not available:
+        logger.warning("No transcripts available for video: %s", video_id)
         return None
+    return available
+
 
+def _fetch_raw(video_id: str, languages: Optional[tuple]):
+    """Fetch a video's FetchedTranscript, or None on any failure.
+
+    Holds the fetch-with-fallback and error handling shared by the full
+    get_transcript path and the text-only path.
+    """
     try:
-        # Instantiate the API
-        ytt_api = YouTubeTranscriptApi()
-
-        # First, list available transcripts
-        try:
-            transcript_list_obj = ytt_api.list(video_id)
-            available_transcripts = list(transcript_list_obj)
-        except Exception as e:
-            print(f"Error: Could not list transcripts for video: {video_id}")
-            print(f"Details: {str(e)}")
-            return None
-
-        if not available_transcripts:
-            print(f"Error: No transcripts available for video: {video_id}")
-            print("This video may not have any transcripts enabled.")
-            return None
-
-        # Try to fetch transcript
-        fetched_transcript = None
+        ytt_api = _get_ytt_api()
 
+        # Fetch directly; listing available transcripts is its own HTTP
+        # round-trip, so it only happens on the NoTranscriptFound
+        # fallback path instead of before every fetch.
         if languages:
             # Try to fetch with specified languages
             try:
-                fetched_transcript = ytt_api.fetch(video_id, languages=languages)
+                return ytt_api.fetch(video_id, languages=languages)
             except NoTranscriptFound:
-                print(f"Warning: Requested languages {languages} not found.")
-                print(f"Available transcripts for video {video_id}:")
-                for t in available_transcripts:
-                    print(f"  - {t.language} ({t.language_code}) - {'Generated' if t.is_generated else 'Manual'}")
+                logger.warning("Requested languages %s not found for video %s.", list(languages), video_id)
+                available_transcripts = _list_available(ytt_api, video_id)
+                if not available_transcripts:
+                    return None
+                if logger.isEnabledFor(logging.DEBUG):
+                    for t in available_transcripts:
+                        logger.debug("Available: %s (%s) - %s", t.language, t.language_code,
+                                     'Generated' if t.is_generated else 'Manual')
                 # Try to use the first available transcript
                 transcript = available_transcripts[0]
-                print(f"\nUsing available transcript: {transcript.language} ({transcript.language_code})")
-                fetched_transcript = transcript.fetch()
+                logger.warning("Using available transcript: %s (%s)", transcript.language, transcript.language_code)
+                return transcript.fetch()
         else:
             # No language specified - try English first, then any available
             try:
-                fetched_transcript = ytt_api.fetch(video_id, languages=['en'])
+                return ytt_api.fetch(video_id, languages=['en'])
             except NoTranscriptFound:
                 # English not available, use first available transcript
+                available_transcripts = _list_available(ytt_api, video_id)
+                if not available_transcripts:
+                    return None
                 transcript = available_transcripts[0]
-                print(f"English transcript not available. Using: {transcript.language} ({transcript.language_code})")
-                fetched_transcript = transcript.fetch()
-
-        # Get raw data as list of dictionaries
-        transcript_list = fetched_transcript.to_raw_data()
-
-        # Combine all transcript entries into a single text
-        full_text = ' '.join([entry['text'] for entry in transcript_list])
-
-        return {
-            'text': full_text,
-            'transcript': transcript_list,
-            'video_id': fetched_transcript.video_id,
-            'language': fetched_transcript.language,
-            'language_code': fetched_transcript.language_code,
-            'is_generated': fetched_transcript.is_generated
-        }
+                logger.warning("English transcript not available. Using: %s (%s)", transcript.language, transcript.language_code)
+                return transcript.fetch()
 
     except TranscriptsDisabled:
-        print(f"Error: Transcripts are disabled for video: {video_id}")
+        logger.warning("Transcripts are disabled for video: %s", video_id)
         return None
     except VideoUnavailable:
-        print(f"Error: Video is unavailable: {video_id}")
+        logger.warning("Video is unavailable: %s", video_id)
         return None
     except Exception as e:
-        print(f"Error fetching transcript: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.error("Error fetching transcript for %s: %s", video_id, e)
+        # Stack formatting is expensive; only walk it when DEBUG output
+        # will actually be emitted
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Transcript fetch failed", exc_info=True)
+        return None
+
+
+@functools.lru_cache(maxsize=512)
+def _get_transcript_cached(video_id: str, languages: Optional[tuple]) -> Optional[dict]:
+    """Fetch and cache one video's transcript; languages must be hashable."""
+    cache_key = f"{video_id}|{','.join(languages or ())}"
+    cached = _disk_cache_get(cache_key)
+    if cached is not None:
+        status, payload = cached
+        return MappingProxyType(payload) if status == 'ok' else None
+
+    fetched_transcript = _fetch_raw(video_id, languages)
+    if fetched_transcript is None:
+        _disk_cache_put(cache_key, None, status='missing')
+        return None
+
+    # Convert entries to compact Snippet tuples (no to_raw_data dict
+    # per entry; use snippets_to_raw_data if you need dicts back)
+    transcript_list = tuple(
+        Snippet(s.text, s.start, s.duration) for s in fetched_transcript.snippets
+    )
+
+    # Join text straight off the snippet tuples with a generator
+    full_text = ' '.join(s.text for s in transcript_list)
+
+    result = {
+        'text': full_text,
+        'transcript': transcript_list,
+        'video_id': fetched_transcript.video_id,
+        'language': fetched_transcript.language,
+        'language_code': fetched_transcript.language_code,
+        'is_generated': fetched_transcript.is_generated
+    }
+    # The plain dict goes to disk (proxies don't pickle); callers get a
+    # read-only view so the lru_cache entry can be shared without
+    # defensive copies.
+    _disk_cache_put(cache_key, result)
+    return MappingProxyType(result)
+
+
+@functools.lru_cache(maxsize=512)
+def _get_transcript_text_cached(video_id: str, languages: Optional[tuple]) -> Optional[str]:
+    """Text-only fetch: no list-of-dicts or metadata dict is built.
+
+    Reuses a full cached payload when one exists (on disk from an earlier
+    get_transcript call) rather than fetching again.
+    """
+    cache_key = f"{video_id}|{','.join(languages or ())}"
+    cached = _disk_cache_get(cache_key)
+    if cached is not None:
+        status, payload = cached
+        return payload['text'] if status == 'ok' else None
+
+    fetched_transcript = _fetch_raw(video_id, languages)
+    if fetched_transcript is None:
+        _disk_cache_put(cache_key, None, status='missing')
         return None
+    return ' '.join(s.text for s in fetched_transcript.snippets)
+
+
+async def get_transcripts_async(
+    urls: list,
+    languages: Optional[list] = None,
+    concurrency: int = 16
+) -> dict:
+    """
+    Fetch transcripts for many videos concurrently.
+
+    youtube-transcript-api blocks on requests under the hood, so each
+    fetch runs in the default thread pool while asyncio overlaps the
+    network waits — wall-clock approaches the slowest fetch instead of
+    the sum.
+
+    Args:
+        urls: YouTube video URLs
+        languages: List of language codes applied to every fetch
+        concurrency: Maximum number of in-flight fetches
+
+    Returns:
+        Dict mapping each URL to its get_transcript result (None on
+        failure; exceptions are captured per-URL, not raised)
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(url):
+        async with semaphore:
+            return await loop.run_in_executor(None, get_transcript, url, languages)
+
+    results = await asyncio.gather(*(fetch(url) for url in urls), return_exceptions=True)
+    return {
+        url: (None if isinstance(result, BaseException) else result)
+        for url, result in zip(urls, results)
+    }
+
+
+def get_transcripts(urls: list, languages: Optional[list] = None, workers: int = 8) -> dict:
+    """
+    Fetch transcripts for many videos across a thread pool.
+
+    Plain-threads counterpart to get_transcripts_async for synchronous
+    callers: no event loop required (and safe to call from code that
+    already runs inside one, where asyncio.run would raise).
+
+    Args:
+        urls: YouTube video URLs
+        languages: List of language codes applied to every fetch
+        workers: Thread pool size
+
+    Returns:
+        Dict mapping each URL to its get_transcript result (None on
+        failure)
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(get_transcript, url, languages): url for url in urls}
+        results = {}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception:
+                results[futures[future]] = None
+    return results
 
 
 def get_transcript_text(video_url: str, languages: Optional[list] = None) -> Optional[str]:
@@ -138,8 +424,11 @@ def get_transcript_text(video_url: str, languages: Optional[list] = None) -> Opt
     Returns:
         Transcript text as string, or None if unavailable
     """
-    result = get_transcript(video_url, languages)
-    return result['text'] if result else None
+    video_id = extract_video_id(video_url)
+    if not video_id:
+        logger.error("Could not extract video ID from URL: %s", video_url)
+        return None
+    return _get_transcript_text_cached(video_id, tuple(languages) if languages else None)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,12 @@
+import functools
 import os
 import sys
 import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-import ta
+import numpy as np
+import orjson
 import base64
 from datetime import datetime
 from pydantic import BaseModel
@@ -15,6 +18,7 @@ sys.path.insert(0, project_root)
 
 # Import from new locations
 from functions.fg_index import get_fear_greed_index
+from functions.indicators import sma_ema_bb, rsi_macd
 from functions.news import get_news_sentiment_summary
 from functions.chart_img import take_full_page_screenshot
 from functions.sql_db import insert_decision
@@ -22,26 +26,188 @@ from functions.sql_db import insert_decision
 load_dotenv()
 TRADE_ON = False
 
+# Read once at import; the environment doesn't change between loop runs
+UPBIT_ACCESS = os.getenv("UPBIT_OPEN_API_ACCESS_KEY")
+UPBIT_SECRET = os.getenv("UPBIT_OPEN_API_SECRET_KEY")
+
+# Columns actually sent to the model. The strategy treats indicators as
+# supplementary, so only RSI and the Bollinger band edges accompany OHLCV;
+# the rest (macd*, sma20, ema12, bb middle) would just inflate the prompt.
+PROMPT_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'rsi', 'bb_bbhi', 'bb_bbli']
+
+# Rows the model actually sees per timeframe. The fetches below pull
+# extra leading bars beyond these so the 20-period Bollinger and 26-period
+# EMA warm-up lands on rows we discard, instead of sending the model a
+# tail full of NaN indicators.
+DAILY_PROMPT_BARS = 30
+HOURLY_PROMPT_BARS = 24
+INDICATOR_WARMUP_BARS = 40
+
 def add_indicators(df):
-    # bollinger bands
-    indicator_bb = ta.volatility.BollingerBands(df['close'], window=20, window_dev=2)
-    df['bb_bbm'] = indicator_bb.bollinger_mavg()
-    df['bb_bbhi'] = indicator_bb.bollinger_hband()
-    df['bb_bbli'] = indicator_bb.bollinger_lband()
+    close = df['close'].to_numpy(np.float64)
+
+    # SMA(20), EMA(12) and Bollinger Bands (20, 2.0) in one fused pass
+    sma20, ema12, bb_bbm, bb_bbhi, bb_bbli = sma_ema_bb(close, 20, 12, 2.0)
+
+    # RSI(14) and MACD(12, 26, 9) in a second fused pass
+    rsi, macd, macd_signal, macd_diff = rsi_macd(close, 14, 12, 26, 9)
+
+    return df.assign(
+        bb_bbm=bb_bbm,
+        bb_bbhi=bb_bbhi,
+        bb_bbli=bb_bbli,
+        rsi=rsi,
+        macd=macd,
+        macd_signal=macd_signal,
+        macd_diff=macd_diff,
+        sma20=sma20,
+        ema12=ema12,
+    )
+
+# Strategy text cache keyed by path: (mtime, contents). The file changes
+# rarely, and an identical system-message prefix across calls is also what
+# lets OpenAI's server-side prompt cache hit.
+_strategy_cache = {}
+
+def load_trading_strategy(strategy_path):
+    """Read the strategy markdown, reusing the cached text while the file's
+    mtime is unchanged. Returns '' if the file can't be read."""
+    try:
+        mtime = os.path.getmtime(strategy_path)
+        cached = _strategy_cache.get(strategy_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(strategy_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        _strategy_cache[strategy_path] = (mtime, text)
+        print(f"Trading strategy loaded from {strategy_path}")
+        return text
+    except Exception as e:
+        print(f"Warning: Could not load trading strategy: {e}")
+        return ""
+
+# Authenticated Upbit client shared across loop iterations, so repeat runs
+# reuse its underlying HTTP session instead of rebuilding the client.
+_upbit_client = None
+
+def get_upbit_client():
+    global _upbit_client
+    if _upbit_client is None:
+        import pyupbit
+        _upbit_client = pyupbit.Upbit(UPBIT_ACCESS, UPBIT_SECRET)
+    return _upbit_client
+
+# OpenAI client created on first use and reused afterwards: the import is
+# ~0.3s of cold-start we only want in runs that reach the LLM call, and a
+# shared client keeps its HTTPS connection pool warm across loop iterations.
+_openai_client = None
+
+def get_openai_client():
+    global _openai_client
+    if _openai_client is None:
+        from openai import OpenAI
+        _openai_client = OpenAI()
+    return _openai_client
+
+def df_to_compact_json(df):
+    """Serialize a DataFrame as column-first JSON via orjson (C encoder).
+
+    Records orient repeats every field name on every row — hundreds of
+    repeated key strings across the daily and hourly frames. Naming the
+    columns once and sending the rows as plain arrays carries the same
+    data in roughly half the prompt tokens.
+    """
+    return orjson.dumps(
+        {"columns": df.columns.tolist(), "data": df.to_numpy().tolist()},
+        option=orjson.OPT_SERIALIZE_NUMPY,
+    ).decode()
+
+def compress_chart_image(png_bytes):
+    """Re-encode the chart PNG as lossy WebP for the OpenAI payload.
+
+    Chrome's screenshot PNGs run 300KB+ and base64 adds another third;
+    WebP at quality 85 keeps the chart legible at a fraction of the
+    bytes, which directly cuts upload latency. Falls back to the raw
+    PNG if Pillow is unavailable or the re-encode fails.
+
+    Returns:
+        Tuple (image_bytes, mime_type)
+    """
+    try:
+        from io import BytesIO
+        from PIL import Image
+        buf = BytesIO()
+        Image.open(BytesIO(png_bytes)).convert("RGB").save(buf, format="WEBP", quality=85)
+        return buf.getvalue(), "image/webp"
+    except Exception as e:
+        print(f"Warning: WebP re-encode failed, sending PNG: {e}")
+        return png_bytes, "image/png"
+
+def orderbook_to_json(orderbook):
+    """Serialize the orderbook for the prompt as compact column-oriented JSON.
+
+    The raw orderbook is ~15 one-dict-per-level rows whose Python repr is
+    full of quotes and whitespace; four parallel price/size arrays carry
+    the same information in far fewer prompt tokens.
+    """
+    units = orderbook.get("orderbook_units") or []
+    return orjson.dumps({
+        "timestamp": orderbook.get("timestamp"),
+        "total_bid_size": orderbook.get("total_bid_size"),
+        "total_ask_size": orderbook.get("total_ask_size"),
+        "bid_price": [u["bid_price"] for u in units],
+        "bid_size": [u["bid_size"] for u in units],
+        "ask_price": [u["ask_price"] for u in units],
+        "ask_size": [u["ask_size"] for u in units],
+    }).decode()
+
+# System prompt template, rendered once per strategy text below. Keeping
+# the rendered string byte-identical across calls also keeps OpenAI's
+# server-side prompt cache hitting.
+_SYSTEM_PROMPT_TEMPLATE = """You are a ADA coin investing expert following a proven trading strategy. Tell the user whether to buy, sell or hold at the moment based on the input data provided by user and the trading strategy below.
+
+            === TRADING STRATEGY ===
+            {trading_strategy}
+
+            === INPUT DATA EXPLANATION ===
+            - Current investment portfolio: includes currency, balance, locked
+            - Orderbook price: includes current price and bid/ask price
+            - Daily data: includes ohlcv, rsi, bollinger band upper/lower
+            - Hourly data: includes ohlcv, rsi, bollinger band upper/lower
+            - Daily and hourly data are column-first JSON: 'columns' names the fields once, and each row of 'data' lists values in that column order (oldest row first)
+            - Fear and Greed Index data: includes value, value_classification, timestamp, time_until_update
+            - Chart image: visual representation of the price chart with technical indicators (Bollinger Bands) and 1-hour timeframe
+
+            === ANALYSIS INSTRUCTIONS ===
+            You MUST analyze the data according to the trading strategy principles above. Key points to follow:
+            1. **Chart-Based Trading**: Prioritize technical chart analysis over news-driven trades. Focus on chart patterns, support/resistance levels, and market psychology visible in the chart image.
+            2. **Risk Management**: Consider the strategy's risk management rules (20-30% of capital per trade, conservative approach).
+            3. **Technical Analysis**: While the data includes complex indicators (MACD, RSI, Bollinger Bands), the strategy emphasizes basic chart analysis and market psychology. Use the chart image as the primary source for visual patterns, candlestick formations, and trend identification. Use the technical indicators as supplementary information, not as primary decision drivers.
+            4. **Market Conditions**: Assess whether the market shows clear trends (bullish or bearish) as required by the strategy.
+            5. **Entry/Exit Rules**: Apply the strategy's entry and exit rules based on chart patterns and support/resistance levels.
 
-    # RSI
-    df['rsi'] = ta.momentum.RSIIndicator(df['close'], window=14).rsi()
+            You should consider the current investment portfolio, orderbook price, daily data, hourly data, fear and greed index data, and the chart image to make a decision. Analyze the chart image for visual patterns, support/resistance levels, and market psychology. Think about each data point and go through them in the reasoning process according to the trading strategy. Then make decision based on the data, the strategy principles, and the reasoning process.
 
-    # MACD
-    df['macd'] = ta.trend.MACD(df['close']).macd()
-    df['macd_signal'] = ta.trend.MACD(df['close']).macd_signal()
-    df['macd_diff'] = ta.trend.MACD(df['close']).macd_diff()
+            === OUTPUT FORMAT ===
+            Provide your reasoning in the 'reason' field, your decision (buy, sell, or hold) in the 'decision' field, and a confidence_score (0-100 integer) in the 'confidence_score' field.
 
-    # moving average of 20, 12
-    df['sma20'] = ta.trend.SMAIndicator(df['close'], window=20).sma_indicator()
-    df['ema12'] = ta.trend.EMAIndicator(df['close'], window=12).ema_indicator()
+            In the 'reason' field, you MUST:
+            - Explicitly reference which aspects of the trading strategy you are applying
+            - Explain how the chart analysis aligns with the strategy's principles
+            - Describe how you're using the data according to the strategy (e.g., focusing on chart patterns over complex indicators, considering risk management rules, etc.)
+            - Justify your decision based on the strategy's entry/exit rules and market condition assessment
 
-    return df
+            Confidence score rules:
+            - If decision is 'hold', confidence_score must be 0
+            - If decision is 'buy' or 'sell', confidence_score should be an integer between 0 and 100 representing your confidence level (0 = no confidence, 100 = maximum confidence)
+            - Consider the strategy's emphasis on conservative, disciplined trading when setting confidence scores"""
+
+@functools.lru_cache(maxsize=4)
+def build_system_prompt(trading_strategy):
+    """Render the system prompt for a strategy text, cached per text so
+    loop iterations reuse the same string object until the strategy
+    file changes."""
+    return _SYSTEM_PROMPT_TEMPLATE.format(trading_strategy=trading_strategy)
 
 class TradingDecision(BaseModel):
     """Structured output for trading decision"""
@@ -55,78 +221,97 @@ def ai_trading():
 
     # 1. get upbit chart data - both daily and hourly
     import pyupbit
+    from functions.market_data import (
+        install_pyupbit_keepalive,
+        cached_get_ohlcv,
+        cached_get_current_price,
+    )
+    install_pyupbit_keepalive()
 
-    access = os.getenv("UPBIT_OPEN_API_ACCESS_KEY")
-    secret = os.getenv("UPBIT_OPEN_API_SECRET_KEY")
-    upbit = pyupbit.Upbit(access, secret)
+    upbit = get_upbit_client()
     coin = "ADA"
     trading_fee = 0.0005
 
-    # get balances
-    all_balances = upbit.get_balances()
-    coin_to_watch = ["ADA", "KRW"]
-    filtered_balances = [balance for balance in all_balances if balance["currency"] in coin_to_watch]
-    print(f"balances: {filtered_balances}")
-
-    # orderbook price
-    orderbook = pyupbit.get_orderbook(f"KRW-{coin}")
-    print(f"orderbook: {orderbook}")
-
-    # Get 30 days of daily data
-    df_daily = pyupbit.get_ohlcv(f"KRW-{coin}", interval="day", count=30)
-    df_daily = add_indicators(df_daily)
-    print(f"Daily data shape: {df_daily.shape}")
-
-    # Get 24 hours of hourly data (24 * 1 = 24 hours)
-    df_hourly = pyupbit.get_ohlcv(f"KRW-{coin}", interval="minute60", count=24)
-    df_hourly = add_indicators(df_hourly)
-    print(f"Hourly data shape: {df_hourly.shape}")
-
-    # Convert to JSON format for AI analysis
-    daily_data = df_daily.to_json(orient="records")
-    hourly_data = df_hourly.to_json(orient="records")
-    fg_index_data = get_fear_greed_index(limit=30, date_format='us')
-
-    # get news sentiment summary
-    news_summary = get_news_sentiment_summary(query="ADA cryptocurrency news", time_period="qdr:d", num=10)
-    print(f"News summary: {news_summary}")
-
-    # Read trading strategy (from project root)
-    strategy_path = os.path.join(project_root, "strategy", "strategy_20260125.md")
-    try:
-        with open(strategy_path, "r", encoding="utf-8") as f:
-            trading_strategy = f.read()
-        print(f"Trading strategy loaded from {strategy_path}")
-    except Exception as e:
-        print(f"Warning: Could not load trading strategy: {e}")
-        trading_strategy = ""
-
-    # Capture chart image
-    print("Capturing chart image...")
+    # Chart screenshot destination (charts dir in project root)
     chart_url = f"https://upbit.com/full_chart?code=CRIX.UPBIT.KRW-{coin}"
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    # Ensure charts directory exists (in project root)
     charts_dir = os.path.join(project_root, "charts")
     os.makedirs(charts_dir, exist_ok=True)
     chart_image_path = os.path.join(charts_dir, f"upbit_chart_{coin}_{timestamp}.png")
-    try:
-        chart_image_path = take_full_page_screenshot(
-            url=chart_url,
-            output_filename=chart_image_path
+
+    # Fetch all pre-LLM data concurrently: every call below blocks on the
+    # network independently, so wall time is max(latency) instead of sum.
+    print("Fetching market data concurrently...")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        balances_future = executor.submit(upbit.get_balances)
+        orderbook_future = executor.submit(pyupbit.get_orderbook, f"KRW-{coin}")
+        daily_future = executor.submit(
+            cached_get_ohlcv, f"KRW-{coin}", interval="day",
+            count=DAILY_PROMPT_BARS + INDICATOR_WARMUP_BARS
+        )
+        hourly_future = executor.submit(
+            cached_get_ohlcv, f"KRW-{coin}", interval="minute60",
+            count=HOURLY_PROMPT_BARS + INDICATOR_WARMUP_BARS
+        )
+        fg_index_future = executor.submit(get_fear_greed_index, limit=30, date_format='us')
+        news_future = executor.submit(
+            get_news_sentiment_summary, query="ADA cryptocurrency news", time_period="qdr:d", num=10
+        )
+        chart_future = executor.submit(
+            take_full_page_screenshot, url=chart_url, output_filename=chart_image_path,
+            return_png_bytes=True
         )
-        print(f"Chart image captured: {chart_image_path}")
 
-        # Encode image to base64
-        with open(chart_image_path, "rb") as image_file:
-            chart_image_base64 = base64.b64encode(image_file.read()).decode('utf-8')
-    except Exception as e:
-        print(f"Warning: Could not capture chart image: {e}")
-        chart_image_base64 = None
+        # get balances, keyed by currency for O(1) lookups below
+        all_balances = balances_future.result()
+        coin_to_watch = ["ADA", "KRW"]
+        bal_by_ccy = {balance["currency"]: balance for balance in all_balances}
+        filtered_balances = [bal_by_ccy[c] for c in coin_to_watch if c in bal_by_ccy]
+        print(f"balances: {filtered_balances}")
+
+        # orderbook price
+        orderbook = orderbook_future.result()
+        print(f"orderbook: {orderbook}")
+
+        # 30 days of daily data
+        df_daily = add_indicators(daily_future.result())
+        print(f"Daily data shape: {df_daily.shape}")
+
+        # 24 hours of hourly data (24 * 1 = 24 hours)
+        df_hourly = add_indicators(hourly_future.result())
+        print(f"Hourly data shape: {df_hourly.shape}")
+
+        fg_index_data = fg_index_future.result()
+
+        # news sentiment summary
+        news_summary = news_future.result()
+        print(f"News summary: {news_summary}")
+
+        # chart image (captured in parallel with the data fetches above)
+        try:
+            chart_image_path, chart_png_bytes = chart_future.result()
+            print(f"Chart image captured: {chart_image_path}")
+
+            # Shrink the payload, then encode the in-memory image to
+            # base64 (no disk round-trip)
+            chart_image_bytes, chart_mime_type = compress_chart_image(chart_png_bytes)
+            chart_image_base64 = base64.b64encode(chart_image_bytes).decode('ascii')
+        except Exception as e:
+            print(f"Warning: Could not capture chart image: {e}")
+            chart_image_base64 = None
+            chart_mime_type = "image/png"
+
+    # Convert to JSON format for AI analysis (slim columns, 4-decimal floats
+    # so prompt tokens aren't spent on full float64 repr)
+    daily_data = df_to_compact_json(df_daily[PROMPT_COLUMNS].tail(DAILY_PROMPT_BARS).round(4))
+    hourly_data = df_to_compact_json(df_hourly[PROMPT_COLUMNS].tail(HOURLY_PROMPT_BARS).round(4))
+
+    # Read trading strategy (from project root, cached by mtime)
+    strategy_path = os.path.join(project_root, "strategy", "strategy_20260125.md")
+    trading_strategy = load_trading_strategy(strategy_path)
 
     # 2. give multi-timeframe data to ai and get suggestions
-    from openai import OpenAI
-
-    client = OpenAI()
+    client = get_openai_client()
 
     # Build user content with text and optional image
     user_content = [
@@ -134,7 +319,7 @@ def ai_trading():
             "type": "text",
             "text": f"""Current investment portfolio:\n{filtered_balances}
 
-            Orderbook price:\n{orderbook}
+            Orderbook price:\n{orderbook_to_json(orderbook)}
 
             ### DATA
             Daily data:\n{daily_data}
@@ -152,7 +337,7 @@ def ai_trading():
         user_content.append({
             "type": "image_url",
             "image_url": {
-                "url": f"data:image/png;base64,{chart_image_base64}"
+                "url": f"data:{chart_mime_type};base64,{chart_image_base64}"
             }
         })
 
@@ -161,42 +346,7 @@ def ai_trading():
         messages=[
             {
                 "role": "system",
-                "content": f"""You are a ADA coin investing expert following a proven trading strategy. Tell the user whether to buy, sell or hold at the moment based on the input data provided by user and the trading strategy below.
-
-            === TRADING STRATEGY ===
-            {trading_strategy}
-
-            === INPUT DATA EXPLANATION ===
-            - Current investment portfolio: includes currency, balance, locked
-            - Orderbook price: includes current price and bid/ask price
-            - Daily data: includes ohlcv, bollinger bands, rsi, macd, macd_signal, macd_diff, sma20, ema12
-            - Hourly data: includes ohlcv, bollinger bands, rsi, macd, macd_signal, macd_diff, sma20, ema12
-            - Fear and Greed Index data: includes value, value_classification, timestamp, time_until_update
-            - Chart image: visual representation of the price chart with technical indicators (Bollinger Bands) and 1-hour timeframe
-
-            === ANALYSIS INSTRUCTIONS ===
-            You MUST analyze the data according to the trading strategy principles above. Key points to follow:
-            1. **Chart-Based Trading**: Prioritize technical chart analysis over news-driven trades. Focus on chart patterns, support/resistance levels, and market psychology visible in the chart image.
-            2. **Risk Management**: Consider the strategy's risk management rules (20-30% of capital per trade, conservative approach).
-            3. **Technical Analysis**: While the data includes complex indicators (MACD, RSI, Bollinger Bands), the strategy emphasizes basic chart analysis and market psychology. Use the chart image as the primary source for visual patterns, candlestick formations, and trend identification. Use the technical indicators as supplementary information, not as primary decision drivers.
-            4. **Market Conditions**: Assess whether the market shows clear trends (bullish or bearish) as required by the strategy.
-            5. **Entry/Exit Rules**: Apply the strategy's entry and exit rules based on chart patterns and support/resistance levels.
-
-            You should consider the current investment portfolio, orderbook price, daily data, hourly data, fear and greed index data, and the chart image to make a decision. Analyze the chart image for visual patterns, support/resistance levels, and market psychology. Think about each data point and go through them in the reasoning process according to the trading strategy. Then make decision based on the data, the strategy principles, and the reasoning process.
-
-            === OUTPUT FORMAT ===
-            Provide your reasoning in the 'reason' field, your decision (buy, sell, or hold) in the 'decision' field, and a confidence_score (0-100 integer) in the 'confidence_score' field.
-
-            In the 'reason' field, you MUST:
-            - Explicitly reference which aspects of the trading strategy you are applying
-            - Explain how the chart analysis aligns with the strategy's principles
-            - Describe how you're using the data according to the strategy (e.g., focusing on chart patterns over complex indicators, considering risk management rules, etc.)
-            - Justify your decision based on the strategy's entry/exit rules and market condition assessment
-
-            Confidence score rules:
-            - If decision is 'hold', confidence_score must be 0
-            - If decision is 'buy' or 'sell', confidence_score should be an integer between 0 and 100 representing your confidence level (0 = no confidence, 100 = maximum confidence)
-            - Consider the strategy's emphasis on conservative, disciplined trading when setting confidence scores"""
+                "content": build_system_prompt(trading_strategy)
             },
             {
                 "role": "user",
@@ -218,19 +368,15 @@ def ai_trading():
     print(f'Current ADA: {current_ada}')
 
     # Get current price and average buy price
-    current_price = pyupbit.get_current_price(f"KRW-{coin}")
+    current_price = cached_get_current_price(f"KRW-{coin}")
 
     # Get average buy price from balance data
-    coin_avg_buy_price = None
-    for balance in filtered_balances:
-        if balance["currency"] == coin:
-            avg_buy_price = balance.get("avg_buy_price")
-            if avg_buy_price:
-                coin_avg_buy_price = float(avg_buy_price)
-            break
-
-    # Track trade amount for logging
+    avg_buy_price = bal_by_ccy.get(coin, {}).get("avg_buy_price")
+    coin_avg_buy_price = float(avg_buy_price) if avg_buy_price else None
+
+    # Track trade amount and order receipt for logging
     trade_amount = None
+    order_result = None
 
     if TRADE_ON:
         # Convert confidence_score to decimal (0-100 -> 0.0-1.0)
@@ -257,7 +403,9 @@ def ai_trading():
             my_ada = current_ada
             # Apply confidence_score to the trade volume
             ada_to_sell = my_ada * confidence_decimal
-            current_price = pyupbit.get_orderbook(ticker="KRW-ADA")["orderbook_units"][0]["ask_price"]
+            # Reuse the orderbook fetched for the prompt instead of a second
+            # round trip; it is at most a few seconds old here
+            current_price = orderbook["orderbook_units"][0]["ask_price"]
 
             if ada_to_sell and ada_to_sell * current_price * (1 - trading_fee) > 5000:
                 try:
@@ -273,22 +421,50 @@ def ai_trading():
             print("HOLDING - No action taken")
             trade_amount = 0  # Set trade_amount to 0 for hold decisions
 
-    # Get final balances after trade execution
-    final_cash = upbit.get_balance("KRW")
-    final_ada = upbit.get_balance(coin)
-
-    # Get updated average buy price after trade
-    all_balances_after = upbit.get_balances()
-    coin_avg_buy_price_after = None
-    for balance in all_balances_after:
-        if balance["currency"] == coin:
-            avg_buy_price = balance.get("avg_buy_price")
-            if avg_buy_price:
-                coin_avg_buy_price_after = float(avg_buy_price)
-            break
-
-    # Get current price for final logging
-    final_price = pyupbit.get_current_price(f"KRW-{coin}")
+    if order_result is None:
+        # No order was placed (hold, trading disabled, or the order
+        # failed before submission), so the balances and price fetched
+        # before the decision are still the final state.
+        final_cash = current_cash
+        final_ada = current_ada
+        coin_avg_buy_price_after = coin_avg_buy_price
+        final_price = current_price
+    else:
+        # Derive the post-trade state from the order receipt where it
+        # reports a fill; the receipt plus the pre-trade balances carry
+        # everything but sell proceeds, saving the signed balance
+        # round-trips that existed purely for logging.
+        final_cash = final_ada = None
+        coin_avg_buy_price_after = coin_avg_buy_price
+        try:
+            executed = float(order_result.get("executed_volume") or 0)
+            paid_fee = float(order_result.get("paid_fee") or 0)
+            if executed > 0:
+                if result.decision == "buy":
+                    spent_krw = float(order_result.get("price") or 0)
+                    final_cash = current_cash - spent_krw - paid_fee
+                    final_ada = (current_ada or 0) + executed
+                    # Weighted average of the old position and this fill
+                    prev_cost = (coin_avg_buy_price or 0) * (current_ada or 0)
+                    coin_avg_buy_price_after = (prev_cost + spent_krw) / final_ada
+                else:
+                    final_ada = (current_ada or 0) - executed
+                    # Sell proceeds aren't in the receipt; one KRW
+                    # balance read instead of the previous three calls
+                    final_cash = upbit.get_balance("KRW")
+        except (TypeError, ValueError, ZeroDivisionError) as e:
+            print(f"Warning: could not derive post-trade balances from order result: {e}")
+
+        if final_cash is None or final_ada is None:
+            # Receipt missing fields or no fill reported yet: fall back
+            # to asking the exchange
+            final_cash = upbit.get_balance("KRW")
+            final_ada = upbit.get_balance(coin)
+            bal_by_ccy_after = {balance["currency"]: balance for balance in upbit.get_balances()}
+            avg_buy_price = bal_by_ccy_after.get(coin, {}).get("avg_buy_price")
+            coin_avg_buy_price_after = float(avg_buy_price) if avg_buy_price else None
+
+        final_price = cached_get_current_price(f"KRW-{coin}")
 
     # Log the trading decision to database (after trade execution)
     try:
@@ -0,0 +1,36 @@
+"""
+Shared pytest fixtures for the test suite.
+"""
+
+import os
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def serpapi_response_cache():
+    """Optionally serve SerpAPI responses from an on-disk cache.
+
+    The live network test issues the same two queries every run, burning
+    quota and seconds. With USE_SERPAPI_CACHE=1 (and requests-cache
+    installed), the news module's pooled session is swapped for a
+    CachedSession backed by SQLite, so repeat runs within the hour read
+    from disk instead of the network. Off by default so normal runs
+    exercise the real client path.
+    """
+    if os.getenv("USE_SERPAPI_CACHE") != "1":
+        yield
+        return
+
+    try:
+        import requests_cache
+    except ImportError:
+        yield
+        return
+
+    from functions import news
+
+    original_session = news._SESSION
+    news._SESSION = requests_cache.CachedSession("serpapi_cache", expire_after=3600)
+    yield
+    news._SESSION = original_session
@@ -0,0 +1,127 @@
+"""
+Pytest tests for the NumPy indicator kernels.
+Verifies sma_ema_bb and rsi_macd against reference pandas computations.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from functions.indicators import (
+    sma_ema_bb,
+    rsi_macd,
+    EmaState,
+    RsiState,
+    BollingerState,
+)
+
+
+@pytest.fixture
+def close_series():
+    """Deterministic pseudo-random walk close prices (30 daily bars)."""
+    rng = np.random.default_rng(7)
+    return pd.Series(100.0 + np.cumsum(rng.normal(0.0, 1.0, 30)))
+
+
+class TestSmaEmaBb:
+
+    def test_sma_matches_rolling_mean(self, close_series):
+        sma20, _, _, _, _ = sma_ema_bb(close_series.to_numpy(), 20, 12, 2.0)
+        expected = close_series.rolling(20).mean().to_numpy()
+        np.testing.assert_allclose(sma20, expected, atol=1e-9)
+
+    def test_ema_matches_pandas_ewm(self, close_series):
+        _, ema12, _, _, _ = sma_ema_bb(close_series.to_numpy(), 20, 12, 2.0)
+        expected = close_series.ewm(span=12, min_periods=12, adjust=False).mean().to_numpy()
+        np.testing.assert_allclose(ema12, expected, atol=1e-9)
+
+    def test_bollinger_bands_match_rolling_std(self, close_series):
+        _, _, bb_mid, bb_hi, bb_lo = sma_ema_bb(close_series.to_numpy(), 20, 12, 2.0)
+        mean = close_series.rolling(20).mean()
+        std = close_series.rolling(20).std(ddof=0)
+        np.testing.assert_allclose(bb_mid, mean.to_numpy(), atol=1e-9)
+        np.testing.assert_allclose(bb_hi, (mean + 2.0 * std).to_numpy(), atol=1e-9)
+        np.testing.assert_allclose(bb_lo, (mean - 2.0 * std).to_numpy(), atol=1e-9)
+
+    def test_warmup_entries_are_nan(self, close_series):
+        sma20, ema12, _, bb_hi, _ = sma_ema_bb(close_series.to_numpy(), 20, 12, 2.0)
+        assert np.isnan(sma20[:19]).all() and not np.isnan(sma20[19])
+        assert np.isnan(ema12[:11]).all() and not np.isnan(ema12[11])
+        assert np.isnan(bb_hi[:19]).all() and not np.isnan(bb_hi[19])
+
+
+class TestRsiMacd:
+
+    def test_rsi_matches_wilder_smoothing(self, close_series):
+        rsi, _, _, _ = rsi_macd(close_series.to_numpy(), 14, 12, 26, 9)
+        diff = close_series.diff(1)
+        up = diff.where(diff > 0, 0.0)
+        down = -diff.where(diff < 0, -0.0)
+        ema_up = up.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+        ema_down = down.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+        expected = (100.0 - 100.0 / (1.0 + ema_up / ema_down)).to_numpy()
+        np.testing.assert_allclose(rsi, expected, atol=1e-9)
+
+    def test_rsi_bounds(self, close_series):
+        rsi, _, _, _ = rsi_macd(close_series.to_numpy(), 14, 12, 26, 9)
+        valid = rsi[~np.isnan(rsi)]
+        assert len(valid) > 0
+        assert ((valid >= 0.0) & (valid <= 100.0)).all()
+
+    def test_macd_matches_ema_difference(self, close_series):
+        # Use a longer series so the 26-bar slow EMA has valid output
+        rng = np.random.default_rng(11)
+        close = pd.Series(100.0 + np.cumsum(rng.normal(0.0, 1.0, 60)))
+        _, macd, macd_signal, macd_diff = rsi_macd(close.to_numpy(), 14, 12, 26, 9)
+        ema_fast = close.ewm(span=12, min_periods=12, adjust=False).mean()
+        ema_slow = close.ewm(span=26, min_periods=26, adjust=False).mean()
+        expected_macd = ema_fast - ema_slow
+        expected_signal = expected_macd.ewm(span=9, min_periods=9, adjust=False).mean()
+        np.testing.assert_allclose(macd, expected_macd.to_numpy(), atol=1e-9)
+        np.testing.assert_allclose(macd_signal, expected_signal.to_numpy(), atol=1e-9)
+        np.testing.assert_allclose(
+            macd_diff, (expected_macd - expected_signal).to_numpy(), atol=1e-9
+        )
+
+    def test_short_series_is_all_nan_for_macd_signal(self, close_series):
+        # 30 bars is shorter than the 26+9 signal warmup: signal/diff stay NaN
+        _, _, macd_signal, macd_diff = rsi_macd(close_series.to_numpy(), 14, 12, 26, 9)
+        assert np.isnan(macd_signal[:33]).all()
+        assert np.isnan(macd_diff[:33]).all()
+
+    def test_empty_input(self):
+        rsi, macd, macd_signal, macd_diff = rsi_macd(np.array([]), 14, 12, 26, 9)
+        assert len(rsi) == len(macd) == len(macd_signal) == len(macd_diff) == 0
+
+
+class TestStreamingStates:
+
+    def test_ema_state_matches_batch_kernel(self, close_series):
+        close = close_series.to_numpy()
+        _, ema12, _, _, _ = sma_ema_bb(close, 20, 12, 2.0)
+        state = EmaState(12)
+        streamed = np.array([
+            np.nan if (v := state.update(c)) is None else v for c in close
+        ])
+        np.testing.assert_allclose(streamed, ema12, atol=1e-9)
+
+    def test_rsi_state_matches_batch_kernel(self, close_series):
+        close = close_series.to_numpy()
+        rsi, _, _, _ = rsi_macd(close, 14, 12, 26, 9)
+        state = RsiState(14)
+        streamed = np.array([
+            np.nan if (v := state.update(c)) is None else v for c in close
+        ])
+        np.testing.assert_allclose(streamed, rsi, atol=1e-9)
+
+    def test_bollinger_state_matches_batch_kernel(self, close_series):
+        close = close_series.to_numpy()
+        _, _, bb_mid, bb_hi, bb_lo = sma_ema_bb(close, 20, 12, 2.0)
+        state = BollingerState(20, 2.0)
+        for i, c in enumerate(close):
+            result = state.update(c)
+            if i < 19:
+                assert result is None
+            else:
+                mid, hi, lo = result
+                np.testing.assert_allclose([mid, hi, lo], [bb_mid[i], bb_hi[i], bb_lo[i]], atol=1e-9)
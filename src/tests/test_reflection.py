@@ -3,24 +3,56 @@ Pytest tests for reflection module functions.
 Tests price data fetching, trade analysis, and reflection generation.
 """
 
+import functools
+
 import pytest
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
+import numpy as np
 import pandas as pd
 
 from functions.reflection import (
     get_future_price_data,
     analyze_trade_result,
-    generate_reflection
+    analyze_trade_results_bulk,
+    generate_reflection,
+    _ohlcv_cache
 )
 
 
-@pytest.fixture
-def sample_trade_buy():
+def make_openai_response(text):
+    """Build a parsed-completion response shell carrying one reflection.
+
+    Only attribute reads happen on the response, so plain namespaces do;
+    the callable/assertable part stays a Mock at the parse() seam.
+    """
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(parsed=SimpleNamespace(reflection=text)))]
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_ohlcv_cache():
+    """Keep the per-coin OHLCV cache from leaking between tests."""
+    _ohlcv_cache.clear()
+    yield
+    _ohlcv_cache.clear()
+
+
+@pytest.fixture(scope="session")
+def _now():
+    """Single time baseline shared by the session-scoped sample data, so
+    every fixture derives its offsets from one datetime.now() call."""
+    return datetime.now()
+
+
+@pytest.fixture(scope="session")
+def sample_trade_buy(_now):
     """Sample BUY trade record."""
     return {
         'id': 1,
-        'timestamp': (datetime.now() - timedelta(hours=25)).isoformat(),
+        'timestamp': (_now - timedelta(hours=25)).isoformat(),
         'decision': 'buy',
         'confidence_score': 75.0,
         'reason': 'Strong bullish signal on chart with RSI oversold',
@@ -34,12 +66,12 @@ def sample_trade_buy():
     }
 
 
-@pytest.fixture
-def sample_trade_sell():
+@pytest.fixture(scope="session")
+def sample_trade_sell(_now):
     """Sample SELL trade record."""
     return {
         'id': 2,
-        'timestamp': (datetime.now() - timedelta(hours=30)).isoformat(),
+        'timestamp': (_now - timedelta(hours=30)).isoformat(),
         'decision': 'sell',
         'confidence_score': 60.0,
         'reason': 'Overbought conditions, taking profits',
@@ -53,12 +85,12 @@ def sample_trade_sell():
     }
 
 
-@pytest.fixture
-def sample_trade_hold():
+@pytest.fixture(scope="session")
+def sample_trade_hold(_now):
     """Sample HOLD trade record."""
     return {
         'id': 3,
-        'timestamp': (datetime.now() - timedelta(hours=26)).isoformat(),
+        'timestamp': (_now - timedelta(hours=26)).isoformat(),
         'decision': 'hold',
         'confidence_score': 0.0,
         'reason': 'Market conditions unclear, waiting for better signal',
@@ -72,23 +104,26 @@ def sample_trade_hold():
     }
 
 
-@pytest.fixture
-def mock_price_data_increasing():
+@pytest.fixture(scope="session")
+def mock_price_data_increasing(_now):
     """Mock price data showing increasing trend.
     - For BUY at 1000: avg 1300 > 1000 = gain (price went up after buying)
     - For SELL at 1200: avg 1300 > 1200 = loss (price went up after selling, missed opportunity)
     """
-    base_time = datetime.now() - timedelta(hours=24)
-    data = []
-    for i in range(24):
-        data.append({
-            'timestamp': (base_time + timedelta(hours=i)).isoformat(),
-            'open': 1100.0 + i * 10,
-            'high': 1110.0 + i * 10,
-            'low': 1090.0 + i * 10,
-            'close': 1105.0 + i * 10,
-            'volume': 1000000.0
-        })
+    base_time = _now - timedelta(hours=24)
+    # Broadcast the hour offsets once instead of 24 scalar loop bodies
+    steps = np.arange(24) * 10.0
+    timestamps = pd.date_range(base_time, periods=24, freq='h').strftime('%Y-%m-%dT%H:%M:%S').tolist()
+    data = [
+        {'timestamp': t, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': 1000000.0}
+        for t, o, h, l, c in zip(
+            timestamps,
+            (1100.0 + steps).tolist(),
+            (1110.0 + steps).tolist(),
+            (1090.0 + steps).tolist(),
+            (1105.0 + steps).tolist(),
+        )
+    ]
 
     return {
         'ohlcv_data': data,
@@ -99,23 +134,25 @@ def mock_price_data_increasing():
     }
 
 
-@pytest.fixture
-def mock_price_data_decreasing():
+@pytest.fixture(scope="session")
+def mock_price_data_decreasing(_now):
     """Mock price data showing decreasing trend.
     - For BUY at 1000: avg 950 < 1000 = loss (price went down after buying)
     - For SELL at 1200: avg 950 < 1200 = gain (price went down after selling, good timing)
     """
-    base_time = datetime.now() - timedelta(hours=24)
-    data = []
-    for i in range(24):
-        data.append({
-            'timestamp': (base_time + timedelta(hours=i)).isoformat(),
-            'open': 1000.0 - i * 2,
-            'high': 1010.0 - i * 2,
-            'low': 990.0 - i * 2,
-            'close': 995.0 - i * 2,
-            'volume': 1000000.0
-        })
+    base_time = _now - timedelta(hours=24)
+    steps = np.arange(24) * 2.0
+    timestamps = pd.date_range(base_time, periods=24, freq='h').strftime('%Y-%m-%dT%H:%M:%S').tolist()
+    data = [
+        {'timestamp': t, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': 1000000.0}
+        for t, o, h, l, c in zip(
+            timestamps,
+            (1000.0 - steps).tolist(),
+            (1010.0 - steps).tolist(),
+            (990.0 - steps).tolist(),
+            (995.0 - steps).tolist(),
+        )
+    ]
 
     return {
         'ohlcv_data': data,
@@ -126,28 +163,42 @@ def mock_price_data_decreasing():
     }
 
 
+@pytest.fixture(scope="session")
+def ohlcv_factory():
+    """Factory for mock hourly OHLCV frames, memoized per parameter set.
+
+    Several tests build near-identical date_range + DataFrame payloads;
+    the lru_cache shares one frame per (start, end, close, close_head)
+    combination across the session. Callers only read the frames (they
+    go straight into mock return values), so sharing is safe.
+    """
+    @functools.lru_cache(maxsize=32)
+    def make(start, end, close=1005.0, close_head=()):
+        dates = pd.date_range(start=start, end=end, freq='h')
+        closes = np.full(len(dates), close)
+        if close_head:
+            closes[:len(close_head)] = close_head
+        return pd.DataFrame({
+            'open': np.full(len(dates), 1000.0),
+            'high': np.full(len(dates), 1010.0),
+            'low': np.full(len(dates), 990.0),
+            'close': closes,
+            'volume': np.full(len(dates), 1000000.0)
+        }, index=dates)
+    return make
+
+
 class TestGetFuturePriceData:
     """Test the get_future_price_data function."""
 
     @patch('functions.reflection.pyupbit.get_ohlcv')
-    def test_returns_data_for_valid_timestamp(self, mock_get_ohlcv):
+    def test_returns_data_for_valid_timestamp(self, mock_get_ohlcv, _now, ohlcv_factory):
         """Test that function returns price data for a valid old timestamp."""
-        # Mock pyupbit response
-        trade_time = datetime.now() - timedelta(hours=30)
-
-        # Create mock dataframe with hourly data
-        dates = pd.date_range(start=trade_time - timedelta(hours=10),
-                             end=trade_time + timedelta(hours=30),
-                             freq='h')
-        mock_df = pd.DataFrame({
-            'open': [1000.0] * len(dates),
-            'high': [1010.0] * len(dates),
-            'low': [990.0] * len(dates),
-            'close': [1005.0] * len(dates),
-            'volume': [1000000.0] * len(dates)
-        }, index=dates)
+        trade_time = _now - timedelta(hours=30)
 
-        mock_get_ohlcv.return_value = mock_df
+        mock_get_ohlcv.return_value = ohlcv_factory(
+            trade_time - timedelta(hours=10), trade_time + timedelta(hours=30)
+        )
 
         result = get_future_price_data('ADA', trade_time.isoformat(), hours=24)
 
@@ -167,39 +218,49 @@ class TestGetFuturePriceData:
         assert 'error' in result
 
     @patch('functions.reflection.pyupbit.get_ohlcv')
-    def test_handles_api_error(self, mock_get_ohlcv):
+    def test_handles_api_error(self, mock_get_ohlcv, _now):
         """Test handling of API errors."""
         mock_get_ohlcv.return_value = None
 
-        old_time = (datetime.now() - timedelta(hours=30)).isoformat()
+        old_time = (_now - timedelta(hours=30)).isoformat()
         result = get_future_price_data('ADA', old_time, hours=24)
 
         assert 'error' in result
         assert result['hours_available'] == 0
 
     @patch('functions.reflection.pyupbit.get_ohlcv')
-    def test_calculates_average_price(self, mock_get_ohlcv):
+    def test_calculates_average_price(self, mock_get_ohlcv, _now, ohlcv_factory):
         """Test that average price is calculated correctly."""
-        trade_time = datetime.now() - timedelta(hours=30)
-
-        dates = pd.date_range(start=trade_time + timedelta(hours=1),
-                             end=trade_time + timedelta(hours=24),
-                             freq='h')
-        mock_df = pd.DataFrame({
-            'open': [1000.0] * len(dates),
-            'high': [1010.0] * len(dates),
-            'low': [990.0] * len(dates),
-            'close': [1000.0, 1100.0, 1200.0] + [1100.0] * (len(dates) - 3),
-            'volume': [1000000.0] * len(dates)
-        }, index=dates)
+        trade_time = _now - timedelta(hours=30)
 
-        mock_get_ohlcv.return_value = mock_df
+        mock_get_ohlcv.return_value = ohlcv_factory(
+            trade_time + timedelta(hours=1), trade_time + timedelta(hours=24),
+            close=1100.0, close_head=(1000.0, 1100.0, 1200.0)
+        )
 
         result = get_future_price_data('ADA', trade_time.isoformat(), hours=24)
 
         assert result['avg_price'] is not None
         assert isinstance(result['avg_price'], float)
 
+    @patch('functions.reflection.pyupbit.get_ohlcv')
+    def test_ohlcv_fetch_is_cached_per_coin(self, mock_get_ohlcv, _now, ohlcv_factory):
+        """Test that repeated calls for one coin issue a single API fetch."""
+        trade_time = _now - timedelta(hours=30)
+
+        mock_get_ohlcv.return_value = ohlcv_factory(
+            trade_time - timedelta(hours=10), trade_time + timedelta(hours=30)
+        )
+
+        first = get_future_price_data('ADA', trade_time.isoformat(), hours=24)
+        second = get_future_price_data(
+            'ADA', (trade_time + timedelta(hours=2)).isoformat(), hours=24
+        )
+
+        assert mock_get_ohlcv.call_count == 1
+        assert first['hours_available'] > 0
+        assert second['hours_available'] > 0
+
 
 class TestAnalyzeTradeResult:
     """Test the analyze_trade_result function."""
@@ -288,20 +349,63 @@ class TestAnalyzeTradeResult:
         assert abs(result['profit_loss'] - expected_profit_loss) < 0.001
 
 
+class TestAnalyzeTradeResultsBulk:
+    """Test the vectorized analyze_trade_results_bulk function."""
+
+    def test_matches_scalar_analysis(self):
+        """Test that the bulk path agrees with analyze_trade_result."""
+        decisions = ['buy', 'buy', 'sell', 'sell', 'hold', 'buy']
+        trade_prices = [1000.0, 1000.0, 1200.0, 1200.0, 1000.0, 1000.0]
+        avg_futures = [1100.0, 950.0, 1100.0, 1300.0, 1500.0, 1005.0]
+        hours = [24, 24, 24, 24, 24, 24]
+
+        result_types, profit_loss = analyze_trade_results_bulk(
+            decisions, trade_prices, avg_futures, hours
+        )
+
+        for i in range(len(decisions)):
+            scalar = analyze_trade_result(
+                {'decision': decisions[i], 'coin_krw_price': trade_prices[i]},
+                {'avg_price': avg_futures[i], 'hours_available': hours[i]}
+            )
+            assert result_types[i] == scalar['result_type']
+            assert profit_loss[i] == pytest.approx(scalar['profit_loss'])
+
+    def test_missing_future_data_is_neutral(self):
+        """Test that records without future data come back neutral at 0."""
+        result_types, profit_loss = analyze_trade_results_bulk(
+            ['buy', 'sell'],
+            [1000.0, 1200.0],
+            [float('nan'), 1100.0],
+            [0, 24]
+        )
+
+        assert result_types[0] == 'neutral'
+        assert profit_loss[0] == 0.0
+        assert result_types[1] == 'gain'
+
+
 class TestGenerateReflection:
     """Test the generate_reflection function."""
 
-    @patch('functions.reflection.OpenAI')
-    def test_calls_openai_api(self, mock_openai_class, sample_trade_buy, mock_price_data_increasing):
+    @pytest.fixture(autouse=True)
+    def mock_openai(self):
+        """Patch the OpenAI seam once per test and expose the client.
+
+        One fixture replaces the identical per-method @patch plus
+        three-line client setup; tests just set the parse() return
+        value or side effect on self.mock_client.
+        """
+        with patch('functions.reflection.OpenAI') as mock_openai_class:
+            self.mock_client = Mock()
+            mock_openai_class.return_value = self.mock_client
+            yield
+
+    def test_calls_openai_api(self, sample_trade_buy, mock_price_data_increasing):
         """Test that function calls OpenAI API with correct parameters."""
-        # Mock OpenAI response
-        mock_client = Mock()
-        mock_response = Mock()
-        mock_parsed = Mock()
-        mock_parsed.reflection = "This was a good trade decision based on technical analysis."
-        mock_response.choices = [Mock(message=Mock(parsed=mock_parsed))]
-        mock_client.chat.completions.parse.return_value = mock_response
-        mock_openai_class.return_value = mock_client
+        self.mock_client.chat.completions.parse.return_value = make_openai_response(
+            "This was a good trade decision based on technical analysis."
+        )
 
         result = generate_reflection(
             trade_record=sample_trade_buy,
@@ -313,18 +417,11 @@ class TestGenerateReflection:
 
         assert isinstance(result, str)
         assert len(result) > 0
-        mock_client.chat.completions.parse.assert_called_once()
+        self.mock_client.chat.completions.parse.assert_called_once()
 
-    @patch('functions.reflection.OpenAI')
-    def test_includes_trade_context_in_prompt(self, mock_openai_class, sample_trade_buy, mock_price_data_increasing):
+    def test_includes_trade_context_in_prompt(self, sample_trade_buy, mock_price_data_increasing):
         """Test that the prompt includes relevant trade context."""
-        mock_client = Mock()
-        mock_response = Mock()
-        mock_parsed = Mock()
-        mock_parsed.reflection = "Reflection text"
-        mock_response.choices = [Mock(message=Mock(parsed=mock_parsed))]
-        mock_client.chat.completions.parse.return_value = mock_response
-        mock_openai_class.return_value = mock_client
+        self.mock_client.chat.completions.parse.return_value = make_openai_response("Reflection text")
 
         generate_reflection(
             trade_record=sample_trade_buy,
@@ -335,7 +432,7 @@ class TestGenerateReflection:
         )
 
         # Get the call arguments
-        call_args = mock_client.chat.completions.parse.call_args
+        call_args = self.mock_client.chat.completions.parse.call_args
         messages = call_args[1]['messages']
         user_message = messages[1]['content']
 
@@ -345,12 +442,9 @@ class TestGenerateReflection:
         assert '75' in user_message or '75.0' in user_message  # confidence score
         assert sample_trade_buy['reason'] in user_message
 
-    @patch('functions.reflection.OpenAI')
-    def test_handles_api_error(self, mock_openai_class, sample_trade_buy, mock_price_data_increasing):
+    def test_handles_api_error(self, sample_trade_buy, mock_price_data_increasing):
         """Test handling of OpenAI API errors."""
-        mock_client = Mock()
-        mock_client.chat.completions.parse.side_effect = Exception("API Error")
-        mock_openai_class.return_value = mock_client
+        self.mock_client.chat.completions.parse.side_effect = Exception("API Error")
 
         result = generate_reflection(
             trade_record=sample_trade_buy,
@@ -362,28 +456,26 @@ class TestGenerateReflection:
 
         assert 'error' in result.lower()
 
-    @patch('functions.reflection.OpenAI')
-    def test_different_result_types(self, mock_openai_class, sample_trade_buy, mock_price_data_increasing):
+    @pytest.mark.parametrize("result_type,profit_loss", [
+        ("gain", 0.05),
+        ("loss", -0.05),
+        ("neutral", -0.05),
+    ])
+    def test_different_result_types(self, result_type, profit_loss,
+                                    sample_trade_buy, mock_price_data_increasing):
         """Test that function works with different result types."""
-        mock_client = Mock()
-        mock_response = Mock()
-        mock_parsed = Mock()
-        mock_parsed.reflection = "Reflection"
-        mock_response.choices = [Mock(message=Mock(parsed=mock_parsed))]
-        mock_client.chat.completions.parse.return_value = mock_response
-        mock_openai_class.return_value = mock_client
+        self.mock_client.chat.completions.parse.return_value = make_openai_response("Reflection")
 
-        for result_type in ['gain', 'loss', 'neutral']:
-            result = generate_reflection(
-                trade_record=sample_trade_buy,
-                future_price_data=mock_price_data_increasing,
-                result_type=result_type,
-                result_description=f'Test {result_type}',
-                profit_loss=0.05 if result_type == 'gain' else -0.05
-            )
+        result = generate_reflection(
+            trade_record=sample_trade_buy,
+            future_price_data=mock_price_data_increasing,
+            result_type=result_type,
+            result_description=f'Test {result_type}',
+            profit_loss=profit_loss
+        )
 
-            assert isinstance(result, str)
-            assert len(result) > 0
+        assert isinstance(result, str)
+        assert len(result) > 0
 
 
 class TestIntegration:
@@ -391,29 +483,20 @@ class TestIntegration:
 
     @patch('functions.reflection.pyupbit.get_ohlcv')
     @patch('functions.reflection.OpenAI')
-    def test_complete_reflection_flow(self, mock_openai_class, mock_get_ohlcv, sample_trade_buy):
+    def test_complete_reflection_flow(self, mock_openai_class, mock_get_ohlcv, sample_trade_buy, ohlcv_factory):
         """Test the complete flow: fetch data -> analyze -> generate reflection."""
         # Mock price data
         trade_time = datetime.fromisoformat(sample_trade_buy['timestamp'])
-        dates = pd.date_range(start=trade_time + timedelta(hours=1),
-                             end=trade_time + timedelta(hours=24),
-                             freq='h')
-        mock_df = pd.DataFrame({
-            'open': [1000.0] * len(dates),
-            'high': [1010.0] * len(dates),
-            'low': [990.0] * len(dates),
-            'close': [1100.0] * len(dates),
-            'volume': [1000000.0] * len(dates)
-        }, index=dates)
-        mock_get_ohlcv.return_value = mock_df
+        mock_get_ohlcv.return_value = ohlcv_factory(
+            trade_time + timedelta(hours=1), trade_time + timedelta(hours=24),
+            close=1100.0
+        )
 
         # Mock OpenAI
         mock_client = Mock()
-        mock_response = Mock()
-        mock_parsed = Mock()
-        mock_parsed.reflection = "Excellent trade decision with good timing."
-        mock_response.choices = [Mock(message=Mock(parsed=mock_parsed))]
-        mock_client.chat.completions.parse.return_value = mock_response
+        mock_client.chat.completions.parse.return_value = make_openai_response(
+            "Excellent trade decision with good timing."
+        )
         mock_openai_class.return_value = mock_client
 
         # Step 1: Get future price data
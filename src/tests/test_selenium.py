@@ -22,10 +22,83 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from webdriver_manager.chrome import ChromeDriverManager
+import json
+import queue
+import re
+import subprocess
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# webdriver-manager checks the network for driver updates on every
+# install() call. The resolved path is cached on disk keyed by Chrome's
+# major version, so repeat runs skip the check until Chrome upgrades.
+_DRIVER_CACHE_FILE = os.path.expanduser("~/.cache/upbit_autotrade/chromedriver.json")
+
+# Locators built once at import; the '1 Hour' label sits in a <translate>
+# tag whose clickable parent is reached via ./.., which keeps these XPath.
+_PERIOD_MENU_LOCATOR = (By.XPATH, '//*[@id="fullChartiq"]/div/div/div[1]/div/div/cq-menu[1]/span/cq-clickable')
+_ONE_HOUR_LOCATOR = (By.XPATH, "//translate[@original='1 Hour']")
+_STUDIES_MENU_LOCATOR = (By.XPATH, '/html/body/div[1]/div[2]/div[3]/span/div/div/div[1]/div/div/cq-menu[3]')
+_BOLLINGER_LOCATOR = (By.XPATH, '/html/body/div[1]/div[2]/div[3]/span/div/div/div[1]/div/div/cq-menu[3]/cq-menu-dropdown/cq-scroll/cq-studies/cq-studies-content/cq-item[14]')
+
+
+def _click_when_clickable(driver, locator, timeout=10):
+    """Wait for locator to be clickable, click it, and return the element."""
+    element = WebDriverWait(driver, timeout).until(
+        EC.element_to_be_clickable(locator)
+    )
+    element.click()
+    return element
+
+
+def _chrome_major_version():
+    """Return the installed Chrome's major version, or None if unknown."""
+    for binary in ("google-chrome", "chromium-browser", "chromium"):
+        try:
+            out = subprocess.run(
+                [binary, "--version"], capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        match = re.search(r"(\d+)\.", out)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _resolve_chromedriver():
+    """Return a chromedriver path, preferring the on-disk cache.
+
+    Falls back to ChromeDriverManager().install() when the cache is
+    missing, stale (Chrome major changed), or unreadable, and refreshes
+    the cache with the newly resolved path.
+    """
+    major = _chrome_major_version()
+
+    if major:
+        try:
+            with open(_DRIVER_CACHE_FILE) as f:
+                cached = json.load(f)
+            path = cached.get(major)
+            if path and os.path.exists(path):
+                return path
+        except (OSError, ValueError):
+            pass
+
+    path = ChromeDriverManager().install()
+
+    if major:
+        try:
+            os.makedirs(os.path.dirname(_DRIVER_CACHE_FILE), exist_ok=True)
+            with open(_DRIVER_CACHE_FILE, "w") as f:
+                json.dump({major: path}, f)
+        except OSError:
+            pass
+
+    return path
+
 
 def setup_driver():
     """
@@ -44,17 +117,41 @@ def setup_driver():
     chrome_options.add_argument('--disable-blink-features=AutomationControlled')
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
 
-    # Use webdriver-manager to automatically download and setup ChromeDriver
-    service = Service(ChromeDriverManager().install())
+    # The chart is drawn on a canvas, so skipping <img> downloads and
+    # other non-chart resources doesn't affect the screenshot but cuts
+    # the page-load phase considerably.
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-background-networking')
+    chrome_options.add_argument('--disable-sync')
+    chrome_options.add_argument('--metrics-recording-only')
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    # Return from driver.get at DOMContentLoaded; the explicit waits
+    # below cover the chart becoming ready.
+    chrome_options.page_load_strategy = 'eager'
+
+    # Resolve ChromeDriver via the on-disk cache (webdriver-manager only
+    # runs when Chrome's major version changed)
+    service = Service(_resolve_chromedriver())
     driver = webdriver.Chrome(service=service, options=chrome_options)
+    # Explicit WebDriverWaits below do the waiting; an implicit wait on
+    # top of them would stack onto every failed find.
+    driver.implicitly_wait(0)
     return driver
 
 
-def take_full_page_screenshot(url, output_filename=None, width=1920):
+def _capture_with_driver(driver, url, output_filename=None, width=1920):
     """
-    Navigate to a URL and take a full-page screenshot.
+    Navigate an already-running driver to a URL and take a screenshot.
+
+    Shared by take_full_page_screenshot (one driver per call) and
+    ScreenshotPool (drivers reused across URLs).
 
     Args:
+        driver: A Chrome WebDriver instance from setup_driver()
         url (str): The URL to capture
         output_filename (str, optional): Output filename for the screenshot.
                                         If None, generates timestamp-based name.
@@ -63,138 +160,141 @@ def take_full_page_screenshot(url, output_filename=None, width=1920):
     Returns:
         str: Path to the saved screenshot file
     """
-    driver = None
+    # Navigate to URL
+    print(f"Navigating to {url}...")
+    driver.get(url)
 
+    # Wait for the chart container itself instead of a blind sleep:
+    # the wait returns as soon as the chart is in the DOM.
+    print("Waiting for page to load...")
     try:
-        # Set up driver
-        print("Setting up Chrome WebDriver...")
-        driver = setup_driver()
+        WebDriverWait(driver, 15).until(
+            EC.presence_of_element_located((By.ID, "fullChartiq"))
+        )
+    except Exception as e:
+        print(f"Warning: Timeout waiting for chart container: {e}")
+
+    # Get page dimensions for full screenshot
+    print("Calculating page dimensions...")
+    # Use specified width but get full height
+    # total_height = driver.execute_script("return document.body.scrollHeight") # lets comment this out for now.
+    width = 1280
+    total_height = 1080
 
-        # Navigate to URL
-        print(f"Navigating to {url}...")
-        driver.get(url)
+    # Set window size to capture full page with specified width
+    driver.set_window_size(width, total_height)
 
-        # Wait for page to load
-        print("Waiting for page to load...")
-        time.sleep(5)  # Give time for dynamic content to load
+    print(f"Page dimensions: {width}x{total_height}")
 
-        # Try to wait for a specific element (adjust selector as needed)
+    # Brief buffer for the resize to propagate (no DOM event to wait on)
+    time.sleep(0.3)
+
+    # Open the time period menu and select '1시간'
+    print("Opening time period menu...")
+    try:
+        _click_when_clickable(driver, _PERIOD_MENU_LOCATOR)
+        print("Menu opened successfully")
+
+        # Find and click the '1시간' option
+        # The element is wrapped in a <translate> tag with original="1 Hour";
+        # waiting on its visibility doubles as the dropdown-open wait.
+        print("Looking for '1시간' option...")
+        translate_element = WebDriverWait(driver, 10).until(
+            EC.visibility_of_element_located(_ONE_HOUR_LOCATOR)
+        )
+        # Get the parent element (the clickable container)
+        one_hour_option = translate_element.find_element(By.XPATH, "./..")
+        # Use JavaScript click to ensure it works (more reliable for complex UI elements)
+        one_hour_option.click()
+        print("Selected '1시간' option")
+
+        # The dropdown closing signals the selection was applied
+        WebDriverWait(driver, 10).until(
+            EC.invisibility_of_element_located(_ONE_HOUR_LOCATOR)
+        )
+
+        # Open the studies menu and select '볼린저 밴드' (Bollinger Bands)
+        print("Opening studies menu for Bollinger Bands...")
         try:
+            _click_when_clickable(driver, _STUDIES_MENU_LOCATOR)
+            print("Studies menu opened successfully")
+
+            # Find and click the '볼린저 밴드' (Bollinger Bands) option;
+            # element_to_be_clickable also covers the dropdown-open wait.
+            print("Looking for '볼린저 밴드' option...")
+            _click_when_clickable(driver, _BOLLINGER_LOCATOR)
+            print("Selected '볼린저 밴드' option")
+
+            # The study list closing signals the overlay was added
             WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
+                EC.invisibility_of_element_located(_BOLLINGER_LOCATOR)
             )
+
         except Exception as e:
-            print(f"Warning: Timeout waiting for element: {e}")
+            print(f"Warning: Could not select '볼린저 밴드' from menu: {e}")
+            print("Continuing with screenshot anyway...")
+
+    except Exception as e:
+        print(f"Warning: Could not select '1시간' from menu: {e}")
+        print("Continuing with screenshot anyway...")
 
-        # Get page dimensions for full screenshot
-        print("Calculating page dimensions...")
-        # Use specified width but get full height
-        # total_height = driver.execute_script("return document.body.scrollHeight") # lets comment this out for now.
-        width = 1280
-        total_height = 1080
+    # Generate filename if not provided
+    if output_filename is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_filename = f"charts/upbit_screenshot_{timestamp}.png"
 
-        # Set window size to capture full page with specified width
-        driver.set_window_size(width, total_height)
+    # Ensure .png extension
+    if not output_filename.endswith('.png'):
+        output_filename += '.png'
 
-        print(f"Page dimensions: {width}x{total_height}")
+    # Ensure charts directory exists (relative to project root)
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    charts_dir = os.path.join(project_root, 'charts')
+    os.makedirs(charts_dir, exist_ok=True)
 
-        # Wait a bit for resize
-        time.sleep(2)
+    # If output_filename doesn't start with charts/, add it
+    if not output_filename.startswith("charts/"):
+        output_filename = f"charts/{output_filename}"
 
-        # Open the time period menu and select '1시간'
-        print("Opening time period menu...")
-        try:
-            # Wait for the menu element to be clickable
-            menu_xpath = '//*[@id="fullChartiq"]/div/div/div[1]/div/div/cq-menu[1]/span/cq-clickable'
-            menu_element = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, menu_xpath))
-            )
-            menu_element.click()
-            print("Menu opened successfully")
-
-            # Wait a bit for the menu dropdown to appear
-            time.sleep(1)
-
-            # Find and click the '1시간' option
-            # The element is wrapped in a <translate> tag with original="1 Hour"
-            print("Looking for '1시간' option...")
-            # Find the translate element with original="1 Hour", then get its parent clickable element
-            translate_element = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//translate[@original='1 Hour']"))
-            )
-            # Get the parent element (the clickable container)
-            one_hour_option = translate_element.find_element(By.XPATH, "./..")
-            # Use JavaScript click to ensure it works (more reliable for complex UI elements)
-            one_hour_option.click()
-            print("Selected '1시간' option")
-
-            # Wait for the chart to update after selecting the time period
-            time.sleep(2)
-
-            # Open the studies menu and select '볼린저 밴드' (Bollinger Bands)
-            print("Opening studies menu for Bollinger Bands...")
-            try:
-                # Wait for the dropdown menu element to be clickable
-                dropdown_xpath = '/html/body/div[1]/div[2]/div[3]/span/div/div/div[1]/div/div/cq-menu[3]'
-                dropdown_element = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, dropdown_xpath))
-                )
-                dropdown_element.click()
-                print("Studies menu opened successfully")
-
-                # Wait a bit for the menu dropdown to appear
-                time.sleep(1)
-
-                # Find and click the '볼린저 밴드' (Bollinger Bands) option
-                print("Looking for '볼린저 밴드' option...")
-                bollinger_bands_xpath = '/html/body/div[1]/div[2]/div[3]/span/div/div/div[1]/div/div/cq-menu[3]/cq-menu-dropdown/cq-scroll/cq-studies/cq-studies-content/cq-item[14]'
-                bollinger_bands_element = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, bollinger_bands_xpath))
-                )
-                bollinger_bands_element.click()
-                print("Selected '볼린저 밴드' option")
-
-                # Wait for the chart to update after adding Bollinger Bands
-                time.sleep(2)
-
-            except Exception as e:
-                print(f"Warning: Could not select '볼린저 밴드' from menu: {e}")
-                print("Continuing with screenshot anyway...")
+    # Make path absolute
+    if not os.path.isabs(output_filename):
+        output_filename = os.path.join(project_root, output_filename)
 
-        except Exception as e:
-            print(f"Warning: Could not select '1시간' from menu: {e}")
-            print("Continuing with screenshot anyway...")
+    # Take screenshot (short buffer for the final canvas repaint)
+    print("Taking screenshot...")
+    time.sleep(0.3)
+    driver.save_screenshot(output_filename)
 
-        # Generate filename if not provided
-        if output_filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_filename = f"charts/upbit_screenshot_{timestamp}.png"
+    print(f"Screenshot saved successfully: {output_filename}")
 
-        # Ensure .png extension
-        if not output_filename.endswith('.png'):
-            output_filename += '.png'
 
-        # Ensure charts directory exists (relative to project root)
-        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-        charts_dir = os.path.join(project_root, 'charts')
-        os.makedirs(charts_dir, exist_ok=True)
+    return output_filename
 
-        # If output_filename doesn't start with charts/, add it
-        if not output_filename.startswith("charts/"):
-            output_filename = f"charts/{output_filename}"
 
-        # Make path absolute
-        if not os.path.isabs(output_filename):
-            output_filename = os.path.join(project_root, output_filename)
+def take_full_page_screenshot(url, output_filename=None, width=1920):
+    """
+    Navigate to a URL and take a full-page screenshot.
 
-        # Take screenshot
-        print("Taking screenshot...")
-        driver.save_screenshot(output_filename)
+    Starts (and quits) a dedicated driver; use ScreenshotPool when
+    capturing several URLs in one run.
 
-        print(f"Screenshot saved successfully: {output_filename}")
+    Args:
+        url (str): The URL to capture
+        output_filename (str, optional): Output filename for the screenshot.
+                                        If None, generates timestamp-based name.
+        width (int, optional): Width of the screenshot in pixels. Default is 1920.
+
+    Returns:
+        str: Path to the saved screenshot file
+    """
+    driver = None
 
+    try:
+        # Set up driver
+        print("Setting up Chrome WebDriver...")
+        driver = setup_driver()
 
-        return output_filename
+        return _capture_with_driver(driver, url, output_filename, width)
 
     except Exception as e:
         print(f"Error occurred: {type(e).__name__}: {e}")
@@ -207,6 +307,49 @@ def take_full_page_screenshot(url, output_filename=None, width=1920):
             driver.quit()
 
 
+class ScreenshotPool:
+    """
+    A pool of prewarmed headless Chrome instances for multi-URL capture.
+
+    Starting Chrome costs a couple of seconds per process; when capturing
+    several Upbit pairs in one run, the pool starts `size` drivers once
+    and reuses them across URLs. Use as a context manager:
+
+        with ScreenshotPool(size=3) as pool:
+            paths = pool.capture_all([(url1, "ada.png"), (url2, "btc.png")])
+    """
+
+    def __init__(self, size=3):
+        self.size = size
+        self._drivers = queue.Queue()
+
+    def __enter__(self):
+        for _ in range(self.size):
+            self._drivers.put(setup_driver())
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        while not self._drivers.empty():
+            self._drivers.get_nowait().quit()
+        return False
+
+    def capture(self, url, output_filename=None, width=1920):
+        """Capture one URL on a borrowed driver, returning the saved path."""
+        driver = self._drivers.get()
+        try:
+            return _capture_with_driver(driver, url, output_filename, width)
+        finally:
+            # Clear per-site state before the next borrower
+            driver.delete_all_cookies()
+            self._drivers.put(driver)
+
+    def capture_all(self, jobs):
+        """Capture (url, output_filename) pairs concurrently across the pool."""
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(self.capture, url, name) for url, name in jobs]
+            return [f.result() for f in futures]
+
+
 def main():
     """
     Main function to test the screenshot functionality.
@@ -12,11 +12,27 @@ from datetime import datetime, timedelta
 from functions.sql_db import (
     init_db,
     insert_decision,
+    insert_decisions_bulk,
+    get_all_decisions_df,
     get_decisions_without_reflection,
-    update_reflection
+    update_reflection,
+    update_reflections_bulk,
+    _get_write_connection,
+    _write_connections
 )
 
 
+def db_query(db_path, sql, params=()):
+    """Run a verification query on the module's pooled connection.
+
+    Reuses the writer connection sql_db already keeps per path instead of
+    paying a fresh connect + PRAGMA replay for every assertion block.
+    """
+    conn = _get_write_connection(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn.execute(sql, params).fetchall()
+
+
 @pytest.fixture
 def test_db():
     """Create a temporary test database."""
@@ -30,88 +46,49 @@ def test_db():
 
     yield db_path
 
-    # Cleanup
+    # Cleanup: evict and close the pooled connection for this temp path
+    pooled = _write_connections.pop(db_path, None)
+    if pooled is not None:
+        pooled.close()
     if os.path.exists(db_path):
         os.remove(db_path)
 
 
 @pytest.fixture
 def populated_db(test_db):
-    """Create a database with sample trade data."""
-    # Insert sample trades with different timestamps
-
-    # Trade 1: 48 hours old, no reflection
-    old_timestamp = (datetime.now() - timedelta(hours=48)).isoformat()
-    insert_decision(
-        decision="buy",
-        coin_name="ADA",
-        confidence_score=75.0,
-        reason="Strong bullish signal",
-        coin_balance=1000.0,
-        krw_balance=500000.0,
-        coin_avg_buy_price=500.0,
-        coin_krw_price=520.0,
-        trade_amount=100000.0,
-        is_real_trade=False,
-        timestamp=old_timestamp,
-        db_path=test_db
-    )
-
-    # Trade 2: 30 hours old, no reflection
-    medium_timestamp = (datetime.now() - timedelta(hours=30)).isoformat()
-    insert_decision(
-        decision="sell",
-        coin_name="ADA",
-        confidence_score=60.0,
-        reason="Overbought conditions",
-        coin_balance=500.0,
-        krw_balance=800000.0,
-        coin_avg_buy_price=500.0,
-        coin_krw_price=560.0,
-        trade_amount=500.0,
-        is_real_trade=False,
-        timestamp=medium_timestamp,
-        db_path=test_db
-    )
-
-    # Trade 3: 12 hours old, no reflection (too recent)
-    recent_timestamp = (datetime.now() - timedelta(hours=12)).isoformat()
-    insert_decision(
-        decision="hold",
-        coin_name="ADA",
-        confidence_score=0.0,
-        reason="Market unclear",
-        coin_balance=500.0,
-        krw_balance=800000.0,
-        coin_avg_buy_price=500.0,
-        coin_krw_price=550.0,
-        trade_amount=0.0,
-        is_real_trade=False,
-        timestamp=recent_timestamp,
-        db_path=test_db
-    )
-
-    # Trade 4: 50 hours old, already has reflection
-    old_with_reflection = (datetime.now() - timedelta(hours=50)).isoformat()
-    record_id = insert_decision(
-        decision="buy",
-        coin_name="BTC",
-        confidence_score=80.0,
-        reason="Breakout confirmed",
-        coin_balance=0.5,
-        krw_balance=10000000.0,
-        coin_avg_buy_price=50000000.0,
-        coin_krw_price=50500000.0,
-        trade_amount=5000000.0,
-        is_real_trade=False,
-        timestamp=old_with_reflection,
-        db_path=test_db
-    )
+    """Create a database with sample trade data.
+
+    All four trades land via one insert_decisions_bulk transaction (one
+    commit instead of four), since the fixture runs for every test in
+    the query/update classes.
+    """
+    now = datetime.now()
+    insert_decisions_bulk([
+        # Trade 1: 48 hours old, no reflection
+        ((now - timedelta(hours=48)).isoformat(), "buy", 75.0,
+         "Strong bullish signal", "ADA", 1000.0, 500000.0, 500.0, 520.0,
+         100000.0, 0),
+        # Trade 2: 30 hours old, no reflection
+        ((now - timedelta(hours=30)).isoformat(), "sell", 60.0,
+         "Overbought conditions", "ADA", 500.0, 800000.0, 500.0, 560.0,
+         500.0, 0),
+        # Trade 3: 12 hours old, no reflection (too recent)
+        ((now - timedelta(hours=12)).isoformat(), "hold", 0.0,
+         "Market unclear", "ADA", 500.0, 800000.0, 500.0, 550.0,
+         0.0, 0),
+        # Trade 4: 50 hours old, gets a reflection below
+        ((now - timedelta(hours=50)).isoformat(), "buy", 80.0,
+         "Breakout confirmed", "BTC", 0.5, 10000000.0, 50000000.0, 50500000.0,
+         5000000.0, 0),
+    ], db_path=test_db)
 
     # Add reflection to trade 4
+    record_id = db_query(
+        test_db, "SELECT id FROM trading_decisions WHERE coin_name = 'BTC'"
+    )[0][0]
     update_reflection(
         record_id=record_id,
-        reflection_timestamp=datetime.now().isoformat(),
+        reflection_timestamp=now.isoformat(),
         result_type="gain",
         result_description="Price increased 5%",
         reflection="Good decision based on technical analysis",
@@ -127,25 +104,15 @@ class TestDatabaseSchema:
 
     def test_init_db_creates_table(self, test_db):
         """Test that init_db creates the trading_decisions table."""
-        conn = sqlite3.connect(test_db)
-        cursor = conn.cursor()
-
-        # Check table exists
-        cursor.execute("""
+        rows = db_query(test_db, """
             SELECT name FROM sqlite_master
             WHERE type='table' AND name='trading_decisions'
         """)
-        assert cursor.fetchone() is not None
-
-        conn.close()
+        assert rows
 
     def test_reflection_columns_exist(self, test_db):
         """Test that all reflection columns are present."""
-        conn = sqlite3.connect(test_db)
-        cursor = conn.cursor()
-
-        cursor.execute("PRAGMA table_info(trading_decisions)")
-        columns = {row[1]: row[2] for row in cursor.fetchall()}
+        columns = {row[1]: row[2] for row in db_query(test_db, "PRAGMA table_info(trading_decisions)")}
 
         # Check all reflection columns exist with correct types
         assert 'reflection_timestamp' in columns
@@ -155,7 +122,54 @@ class TestDatabaseSchema:
         assert 'profit_loss' in columns
         assert columns['profit_loss'] == 'REAL'
 
-        conn.close()
+
+class TestInsertDecisionsBulk:
+    """Test the insert_decisions_bulk function."""
+
+    def test_bulk_insert_inserts_all_rows(self, test_db):
+        """Test that a batch of rows lands in one call."""
+        base_time = datetime.now() - timedelta(hours=48)
+        rows = [
+            ((base_time + timedelta(minutes=i)).isoformat(), "buy", 60.0,
+             f"Simulated trade {i}", "ADA", 100.0, 500000.0, 500.0, 510.0,
+             50000.0, 0)
+            for i in range(10)
+        ]
+        insert_decisions_bulk(rows, db_path=test_db)
+
+        count, coin = db_query(test_db, "SELECT COUNT(*), MIN(coin_name) FROM trading_decisions")[0]
+
+        assert count == 10
+        assert coin == 'ADA'
+
+    def test_bulk_insert_empty_list_is_noop(self, test_db):
+        """Test that an empty batch neither writes nor raises."""
+        insert_decisions_bulk([], db_path=test_db)
+
+        count = db_query(test_db, "SELECT COUNT(*) FROM trading_decisions")[0][0]
+
+        assert count == 0
+
+
+class TestGetAllDecisionsDf:
+    """Test the DataFrame analytics loader."""
+
+    def test_returns_typed_frame_newest_first(self, populated_db):
+        """Test row count, ordering, and column typing."""
+        df = get_all_decisions_df(db_path=populated_db)
+
+        assert len(df) == 4
+        assert df["timestamp"].is_monotonic_decreasing
+        assert str(df["timestamp"].dtype).startswith("datetime64")
+        assert str(df["profit_loss"].dtype) == "Float64"
+        assert str(df["is_real_trade"].dtype) == "Int8"
+
+    def test_coin_filter(self, populated_db):
+        """Test that the coin filter narrows the frame."""
+        df = get_all_decisions_df(coin_name="BTC", db_path=populated_db)
+
+        assert len(df) == 1
+        assert df.at[0, "coin_name"] == "BTC"
 
 
 class TestGetDecisionsWithoutReflection:
@@ -212,10 +226,24 @@ class TestGetDecisionsWithoutReflection:
             db_path=populated_db
         )
 
-        # Parse timestamps and verify order
-        timestamps = [datetime.fromisoformat(r['timestamp']) for r in result]
+        # ISO-8601 timestamps sort lexicographically, so string order is
+        # chronological order — no need to parse each one
+        timestamps = [r['timestamp'] for r in result]
         assert timestamps == sorted(timestamps)
 
+    def test_pending_scan_uses_partial_index(self, populated_db):
+        """The pending-reflection query should run off its partial index."""
+        plan = db_query(populated_db, """
+            EXPLAIN QUERY PLAN
+            SELECT * FROM trading_decisions
+            WHERE (reflection = '' OR reflection IS NULL)
+            AND timestamp < ?
+            ORDER BY timestamp ASC
+        """, ('9999-01-01T00:00:00',))
+
+        plan_text = " ".join(row['detail'] for row in plan)
+        assert 'idx_td_reflection_pending' in plan_text
+
     def test_no_min_hours_filter(self, populated_db):
         """Test with no minimum hours filter."""
         result = get_decisions_without_reflection(
@@ -247,19 +275,19 @@ class TestUpdateReflection:
             db_path=populated_db
         )
 
-        # Verify update
-        conn = sqlite3.connect(populated_db)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM trading_decisions WHERE id = ?", (trade_id,))
-        row = dict(cursor.fetchone())
-        conn.close()
+        # Verify update: select only the reflection columns so SQLite
+        # skips the wide reason TEXT, and index positionally
+        row = db_query(populated_db, """
+            SELECT reflection_timestamp, result_type, result_description,
+                   reflection, profit_loss
+            FROM trading_decisions WHERE id = ?
+        """, (trade_id,))[0]
 
-        assert row['reflection_timestamp'] == reflection_time
-        assert row['result_type'] == 'gain'
-        assert row['result_description'] == 'Price increased 10%'
-        assert row['reflection'] == 'Excellent trade decision based on strong analysis'
-        assert row['profit_loss'] == 0.10
+        assert row[0] == reflection_time
+        assert row[1] == 'gain'
+        assert row[2] == 'Price increased 10%'
+        assert row[3] == 'Excellent trade decision based on strong analysis'
+        assert row[4] == 0.10
 
     def test_update_with_negative_profit_loss(self, populated_db):
         """Test updating with negative profit/loss."""
@@ -277,12 +305,9 @@ class TestUpdateReflection:
         )
 
         # Verify
-        conn = sqlite3.connect(populated_db)
-        cursor = conn.cursor()
-        cursor.execute("SELECT profit_loss, result_type FROM trading_decisions WHERE id = ?",
-                      (trade_id,))
-        row = cursor.fetchone()
-        conn.close()
+        row = db_query(populated_db,
+                       "SELECT profit_loss, result_type FROM trading_decisions WHERE id = ?",
+                       (trade_id,))[0]
 
         assert row[0] == -0.05
         assert row[1] == 'loss'
@@ -312,6 +337,38 @@ class TestUpdateReflection:
         assert count_after == count_before - 1
         assert not any(t['id'] == trade_id for t in after)
 
+    def test_bulk_update_applies_all_rows(self, populated_db):
+        """Test that update_reflections_bulk updates every queued row."""
+        trades = get_decisions_without_reflection(db_path=populated_db)
+        assert len(trades) >= 2
+
+        reflection_time = datetime.now().isoformat()
+        rows = [
+            (reflection_time, "gain", f"Outcome for trade {t['id']}",
+             f"Reflection for trade {t['id']}", 0.05, t['id'])
+            for t in trades
+        ]
+        update_reflections_bulk(rows, db_path=populated_db)
+
+        # All updated trades drop out of the pending query
+        after = get_decisions_without_reflection(db_path=populated_db)
+        assert len(after) == 0
+
+        # And the fields landed
+        row = db_query(populated_db,
+                       "SELECT reflection, profit_loss FROM trading_decisions WHERE id = ?",
+                       (trades[0]['id'],))[0]
+
+        assert row[0] == f"Reflection for trade {trades[0]['id']}"
+        assert row[1] == 0.05
+
+    def test_bulk_update_empty_list_is_noop(self, populated_db):
+        """Test that an empty batch neither writes nor raises."""
+        before = get_decisions_without_reflection(db_path=populated_db)
+        update_reflections_bulk([], db_path=populated_db)
+        after = get_decisions_without_reflection(db_path=populated_db)
+        assert len(after) == len(before)
+
 
 class TestIntegration:
     """Integration tests for the reflection workflow."""
@@ -356,14 +413,13 @@ class TestIntegration:
         trades_after = get_decisions_without_reflection(min_hours_old=24, db_path=test_db)
         assert len(trades_after) == 0
 
-        # Step 5: Verify reflection data is stored
-        conn = sqlite3.connect(test_db)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM trading_decisions WHERE id = ?", (record_id,))
-        row = dict(cursor.fetchone())
-        conn.close()
-
-        assert row['result_type'] == 'gain'
-        assert row['profit_loss'] == 0.08
-        assert len(row['reflection']) > 0
+        # Step 5: Verify reflection data is stored (narrow SELECT, no
+        # Row-to-dict conversion needed for three columns)
+        row = db_query(test_db, """
+            SELECT result_type, profit_loss, reflection
+            FROM trading_decisions WHERE id = ?
+        """, (record_id,))[0]
+
+        assert row[0] == 'gain'
+        assert row[1] == 0.08
+        assert len(row[2]) > 0
@@ -1,14 +1,81 @@
+import os
+
 import streamlit as st
 
+# Known-valid page identifiers, resolved once per process from
+# Streamlit's page registry so candidate filtering doesn't need to raise
+# and catch an exception per wrong guess. None means the introspection
+# API is unavailable (older Streamlit) and the try/except ladder is the
+# only option.
+_valid_pages: frozenset[str] | None = None
+_valid_pages_resolved = False
+
+
+def _get_valid_pages() -> frozenset[str] | None:
+    """Return the identifiers st.switch_page would accept, if knowable."""
+    global _valid_pages, _valid_pages_resolved
+    if _valid_pages_resolved:
+        return _valid_pages
+    _valid_pages_resolved = True
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        pages = get_script_run_ctx().pages_manager.get_pages()
+        identifiers: set[str] = set()
+        for page in pages.values():
+            name = page.get("page_name", "")
+            script_path = page.get("script_path", "")
+            if name:
+                identifiers.add(name)
+                identifiers.add(name.replace("_", " "))
+            if script_path:
+                basename = os.path.basename(script_path)
+                identifiers.add(basename)
+                identifiers.add(os.path.join(os.path.basename(os.path.dirname(script_path)), basename))
+        _valid_pages = frozenset(identifiers)
+    except Exception:  # pragma: no cover - registry layout varies across versions
+        _valid_pages = None
+    return _valid_pages
+
 
 def _switch_page_with_fallback(page_candidates: list[str]) -> tuple[bool, str | None]:
-    """Try several page identifiers for broad Streamlit version compatibility."""
+    """Try several page identifiers for broad Streamlit version compatibility.
+
+    The first identifier that works is remembered in session state, so
+    reruns jump straight to it instead of re-raising an exception per
+    failed candidate. If the remembered identifier stops working (e.g.
+    after a Streamlit upgrade), it is dropped and the full list retried.
+    """
+    resolved = st.session_state.setdefault("_resolved_pages", {})
+    cache_key = tuple(page_candidates)
+
+    known_good = resolved.get(cache_key)
+    if known_good is not None:
+        try:
+            st.switch_page(known_good)
+            return True, None
+        except Exception:  # pragma: no cover - depends on Streamlit runtime behavior
+            del resolved[cache_key]
+
+    # When the page registry is introspectable, skip candidates it
+    # doesn't list instead of raising through each one.
+    valid = _get_valid_pages()
+    if valid is not None:
+        candidates = [c for c in page_candidates if c in valid] or page_candidates
+    else:
+        candidates = page_candidates
+
     last_error: Exception | None = None
-    for candidate in page_candidates:
+    for candidate in candidates:
+        # Record the candidate before switching: a successful switch_page
+        # may rerun the script without returning control here, and session
+        # state survives the rerun.
+        resolved[cache_key] = candidate
         try:
             st.switch_page(candidate)
             return True, None
         except Exception as exc:  # pragma: no cover - depends on Streamlit runtime behavior
+            resolved.pop(cache_key, None)
             last_error = exc
     err = str(last_error) if last_error else "Unknown navigation error."
     return False, err